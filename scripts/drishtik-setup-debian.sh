@@ -926,8 +926,8 @@ if [[ ! -d "$VENV_DIR" ]]; then
     python3 -m venv "$VENV_DIR"
 fi
 "$VENV_DIR/bin/pip" install --quiet --upgrade pip 2>/dev/null
-"$VENV_DIR/bin/pip" install --quiet paho-mqtt==2.1.0 requests==2.32.5 2>/dev/null
-success "Python venv ready (paho-mqtt + requests)"
+"$VENV_DIR/bin/pip" install --quiet paho-mqtt==2.1.0 requests==2.32.5 orjson==3.10.7 2>/dev/null
+success "Python venv ready (paho-mqtt + requests + orjson)"
 
 # Generate bridge-runtime-config.json
 info "Generating bridge-runtime-config.json..."
@@ -59,8 +59,13 @@ DEFAULT_CONFIG = {
     "openclaw_analysis_webhook_fallback": "",
     "ollama_api": "",
     "ollama_model": "qwen2.5vl:7b",
+    "ollama_concurrency": 2,
     "whatsapp_to": [],
     "cooldown_seconds": 30,
+    "event_worker_threads": 4,
+    "snapshot_wait_seconds": 5.0,
+    "analysis_cache_seconds": 60,
+    "analysis_cache_max_distance": 5,
     "ha_url": "",
     "ha_token": "REPLACE_WITH_HA_LONG_LIVED_TOKEN",
     "camera_zone_lights": {},
@@ -70,6 +75,8 @@ DEFAULT_CONFIG = {
     "quiet_hours_end": 6,
     "ha_home_mode_entity": "input_select.home_mode",
     "ha_known_faces_entity": "binary_sensor.known_faces_present",
+    "ha_state_ttl_seconds": 10,
+    "ha_statestream_prefix": "",
     "exclude_known_faces": False,
     "camera_context_notes": {},
     "camera_policy_zones": {},
@@ -79,12 +86,15 @@ DEFAULT_CONFIG = {
     "event_history_window_seconds": 1800,
     "event_history_max_lines": 5000,
     "phase3_enabled": True,
+    "preflight_low_risk_enabled": True,
     "phase4_enabled": True,
     "phase5_enabled": True,
     "phase8_enabled": True,
     "phase5_confirm_delay_seconds": 4,
     "phase5_confirm_timeout_seconds": 90,
     "phase5_confirm_risks": ["high", "critical"],
+    "log_level": "INFO",
+    "publish_coalesce_ms": 750,
     "ui_auth_enabled": True,
     "ui_users": {
         "admin": {"password": "changeme-admin", "role": "admin"},
@@ -2662,6 +2672,10 @@ class Handler(BaseHTTPRequestHandler):
             return {}
         return json.loads(raw)
 
+    def _normalize_path(self) -> None:
+        # Drop the query string so PUT/POST routes compare against the bare path.
+        self.path = self.path.split("?", 1)[0]
+
     def do_GET(self) -> None:
         parsed = urlparse(self.path)
         if parsed.path == "/":
@@ -2795,6 +2809,7 @@ class Handler(BaseHTTPRequestHandler):
         self._json(404, {"error": "not found"})
 
     def do_PUT(self) -> None:
+        self._normalize_path()
         if not self._require_role("operator"):
             return
         try:
@@ -2893,6 +2908,7 @@ class Handler(BaseHTTPRequestHandler):
         self._json(404, {"error": "not found"})
 
     def do_POST(self) -> None:
+        self._normalize_path()
         try:
             data = self._read_json()
         except Exception as exc:
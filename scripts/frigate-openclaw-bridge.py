@@ -8,18 +8,42 @@ analysis back to MQTT for Home Assistant.
 
 import json
 import base64
+import ctypes
+import ctypes.util
 import logging
+import mmap
 import os
+import queue
 import re
+import select
+import socket
 import sys
 import time
 import fcntl
+import functools
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 import shutil
 
 import paho.mqtt.client as mqtt
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # optional: faster JSON encode/decode on the event path
+except ImportError:
+    orjson = None
+
+try:
+    import imagehash  # optional: perceptual matching for the analysis cache
+    from PIL import Image
+except ImportError:
+    imagehash = None
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -30,6 +54,7 @@ MQTT_USER = "<MQTT_USER>"
 MQTT_PASS = "<MQTT_PASS>"
 MQTT_TOPIC_SUBSCRIBE = "frigate/events"
 MQTT_TOPIC_PUBLISH = "openclaw/frigate/analysis"
+PUBLISH_COALESCE_MS = 750  # hold the "pending" placeholder this long in case the final analysis lands first
 
 FRIGATE_API = "http://localhost:5000"
 OPENCLAW_ANALYSIS_WEBHOOK = os.getenv("OPENCLAW_ANALYSIS_WEBHOOK", "http://localhost:18789/hooks/agent")
@@ -45,6 +70,7 @@ OPENCLAW_SESSIONS_INDEX = OPENCLAW_SESSIONS_DIR / "sessions.json"
 
 OLLAMA_API = os.getenv("OLLAMA_API", "http://<OLLAMA_HOST>:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "qwen2.5vl:7b")
+OLLAMA_CONCURRENCY = 2  # max simultaneous VLM requests across camera workers
 
 SNAPSHOT_DIR = Path("/home/techposts/frigate/storage/ai-snapshots")
 OPENCLAW_WORKSPACE = Path("/home/techposts/.openclaw/workspace")
@@ -55,6 +81,10 @@ WHATSAPP_ENABLED = True
 WHATSAPP_MIN_RISK_LEVEL = "medium"
 
 COOLDOWN_SECONDS = 30  # minimum gap between alerts per camera
+EVENT_WORKER_THREADS = 4  # concurrent event pipelines (one per camera is typical)
+SNAPSHOT_WAIT_SECONDS = 5.0  # upper bound on polling Frigate for the event snapshot
+ANALYSIS_CACHE_SECONDS = 60  # reuse a camera's analysis for a near-identical snapshot; 0 disables
+ANALYSIS_CACHE_MAX_DISTANCE = 5  # phash Hamming distance still treated as the same scene
 
 # ---------------------------------------------------------------------------
 # Home Assistant REST API (Phase 2 — action execution)
@@ -63,16 +93,18 @@ HA_URL = "http://<HA_HOST>:8123"
 HA_TOKEN = "<HA_LONG_LIVED_TOKEN>"
 
 # Camera → zone entity mapping (update entity_ids to match your HA setup)
-CAMERA_ZONE_LIGHTS: dict[str, list[str]] = {
-    "GarageCam":    ["light.garage"],
-    "TopStairCam":  ["light.stairway"],
-    "TerraceCam":   ["light.terrace"],
+CAMERA_ZONE_LIGHTS: dict[str, tuple[str, ...]] = {
+    "GarageCam":    ("light.garage",),
+    "TopStairCam":  ("light.stairway",),
+    "TerraceCam":   ("light.terrace",),
 }
-CAMERA_ZONE_LIGHTS_DEFAULT = ["light.garage"]  # fallback if camera not mapped
+CAMERA_ZONE_LIGHTS_DEFAULT: tuple[str, ...] = ("light.garage",)  # fallback if camera not mapped
 
 # Phase 3 policy context sources (safe defaults if entities are missing)
 HA_HOME_MODE_ENTITY = "input_select.home_mode"
 HA_KNOWN_FACES_ENTITY = "binary_sensor.known_faces_present"
+HA_STATE_TTL_SECONDS = 10  # reuse HA entity states for this long between events
+HA_STATESTREAM_PREFIX = ""  # e.g. "homeassistant" when mqtt_statestream is enabled in HA
 EXCLUDE_KNOWN_FACES = False
 CAMERA_CONTEXT_NOTES: dict[str, str] = {
     "GarageCam": "Garage entry + home entrance zone",
@@ -89,6 +121,7 @@ RECENT_EVENTS_WINDOW_SECONDS = 600  # 10 minutes
 EVENT_HISTORY_FILE = Path("/home/techposts/frigate/storage/events-history.jsonl")
 EVENT_HISTORY_WINDOW_SECONDS = 1800  # 30 minutes
 EVENT_HISTORY_MAX_LINES = 5000
+EVENT_HISTORY_TRIM_EVERY = 500  # appends between trims (file may overshoot by this much)
 
 # Phase 5 confirmation (multi-step reasoning)
 PHASE5_CONFIRM_ENABLED = True
@@ -98,8 +131,10 @@ PHASE5_CONFIRM_RISKS = {"high", "critical"}
 
 # Runtime feature toggles
 PHASE3_ENABLED = True
+PREFLIGHT_LOW_RISK_ENABLED = True  # skip VLM when policy alone says routine/low
 PHASE4_ENABLED = True
 PHASE8_ENABLED = True
+LOG_LEVEL = "INFO"  # raise to WARNING to skip per-event INFO formatting
 
 # Runtime config file (editable by control UI/API)
 RUNTIME_CONFIG_FILE = Path("/home/techposts/frigate/bridge-runtime-config.json")
@@ -113,13 +148,24 @@ QUIET_HOURS_START = 23  # 11 PM
 QUIET_HOURS_END = 6     # 6 AM
 
 # Allowed actions whitelist
-ALLOWED_ACTIONS = {
+ALLOWED_ACTIONS = frozenset((
     "notify_only",
     "notify_and_save_clip",
     "notify_and_light",
     "notify_and_speaker",
     "notify_and_alarm",
+))
+_RISK_LEVELS = frozenset(("low", "medium", "high", "critical"))
+_HIGH_RISKS = frozenset(("high", "critical"))
+_RISK_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+_RISK_DEFAULT_ACTION = {
+    "low": "notify_only",
+    "medium": "notify_and_save_clip",
+    "high": "notify_and_light",
+    "critical": "notify_and_alarm",
 }
+_ESCALATED_ACTIONS = frozenset(("notify_and_alarm", "notify_and_light", "notify_and_speaker"))
+_KNOWN_FACES_ON_STATES = frozenset(("on", "true", "home", "detected"))
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -131,13 +177,34 @@ logging.basicConfig(
 )
 log = logging.getLogger("frigate-bridge")
 
+_MASKED_SECRET_RE = re.compile(r"^\s*\*{8}")
+_ENV_LINE_RE = re.compile(rb"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*[\"']?(.*?)[\"']?\s*$")
+
+
+def _json_loads(data):
+    """Parse JSON from str or bytes (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_bytes(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _looks_masked_secret(val) -> bool:
+    return bool(_MASKED_SECRET_RE.match(str(val or "")))
+
 
 def _load_runtime_config():
     """Load runtime overrides from JSON config file."""
-    if not RUNTIME_CONFIG_FILE.exists():
-        return
     try:
         cfg = json.loads(RUNTIME_CONFIG_FILE.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return
     except Exception as exc:
         log.warning("Failed loading runtime config %s: %s", RUNTIME_CONFIG_FILE, exc)
         return
@@ -145,27 +212,26 @@ def _load_runtime_config():
     def _cfg(name, default):
         return cfg.get(name, default)
 
-    def _looks_masked_secret(val) -> bool:
-        s = str(val or "").strip()
-        return s.startswith("********")
-
     global MQTT_HOST, MQTT_PORT, MQTT_USER, MQTT_PASS
-    global MQTT_TOPIC_SUBSCRIBE, MQTT_TOPIC_PUBLISH
+    global MQTT_TOPIC_SUBSCRIBE, MQTT_TOPIC_PUBLISH, PUBLISH_COALESCE_MS
     global FRIGATE_API
     global OPENCLAW_ANALYSIS_WEBHOOK, OPENCLAW_DELIVERY_WEBHOOK
     global OPENCLAW_TOKEN, OPENCLAW_ANALYSIS_AGENT_NAME, OPENCLAW_DELIVERY_AGENT_NAME
     global OPENCLAW_ANALYSIS_MODEL, OPENCLAW_ANALYSIS_MODEL_FALLBACK, OPENCLAW_ANALYSIS_WEBHOOK_FALLBACK
     global OPENCLAW_SESSIONS_DIR, OPENCLAW_SESSIONS_INDEX
-    global OLLAMA_API, OLLAMA_MODEL
+    global OLLAMA_API, OLLAMA_MODEL, OLLAMA_CONCURRENCY
     global WHATSAPP_TO, WHATSAPP_ENABLED, WHATSAPP_MIN_RISK_LEVEL, WHATSAPP_MIN_RISK_LEVEL, COOLDOWN_SECONDS
+    global EVENT_WORKER_THREADS, SNAPSHOT_WAIT_SECONDS
+    global ANALYSIS_CACHE_SECONDS, ANALYSIS_CACHE_MAX_DISTANCE
     global HA_URL, HA_TOKEN, CAMERA_ZONE_LIGHTS, CAMERA_ZONE_LIGHTS_DEFAULT
     global ALARM_ENTITY, QUIET_HOURS_START, QUIET_HOURS_END
     global HA_HOME_MODE_ENTITY, HA_KNOWN_FACES_ENTITY, EXCLUDE_KNOWN_FACES, CAMERA_CONTEXT_NOTES
+    global HA_STATE_TTL_SECONDS, HA_STATESTREAM_PREFIX
     global CAMERA_POLICY_ZONES, CAMERA_POLICY_ZONE_DEFAULT, RECENT_EVENTS_WINDOW_SECONDS
     global EVENT_HISTORY_FILE, EVENT_HISTORY_WINDOW_SECONDS, EVENT_HISTORY_MAX_LINES
     global PHASE5_CONFIRM_ENABLED, PHASE5_CONFIRM_DELAY_SECONDS
     global PHASE5_CONFIRM_TIMEOUT_SECONDS, PHASE5_CONFIRM_RISKS
-    global PHASE3_ENABLED, PHASE4_ENABLED, PHASE8_ENABLED
+    global PHASE3_ENABLED, PHASE4_ENABLED, PHASE8_ENABLED, PREFLIGHT_LOW_RISK_ENABLED, LOG_LEVEL
     global PHASE5_CONFIRM_ENABLED
 
     MQTT_HOST = str(_cfg("mqtt_host", MQTT_HOST))
@@ -176,6 +242,7 @@ def _load_runtime_config():
         MQTT_PASS = str(_mqtt_pass)
     MQTT_TOPIC_SUBSCRIBE = str(_cfg("mqtt_topic_subscribe", MQTT_TOPIC_SUBSCRIBE))
     MQTT_TOPIC_PUBLISH = str(_cfg("mqtt_topic_publish", MQTT_TOPIC_PUBLISH))
+    PUBLISH_COALESCE_MS = max(0, int(_cfg("publish_coalesce_ms", PUBLISH_COALESCE_MS)))
     FRIGATE_API = str(_cfg("frigate_api", FRIGATE_API))
 
     OPENCLAW_ANALYSIS_WEBHOOK = str(_cfg("openclaw_analysis_webhook", OPENCLAW_ANALYSIS_WEBHOOK))
@@ -192,6 +259,7 @@ def _load_runtime_config():
     OPENCLAW_SESSIONS_INDEX = OPENCLAW_SESSIONS_DIR / "sessions.json"
     OLLAMA_API = str(_cfg("ollama_api", OLLAMA_API))
     OLLAMA_MODEL = str(_cfg("ollama_model", OLLAMA_MODEL))
+    OLLAMA_CONCURRENCY = max(1, int(_cfg("ollama_concurrency", OLLAMA_CONCURRENCY)))
 
     recipients = _cfg("whatsapp_to", WHATSAPP_TO)
     if isinstance(recipients, list) and recipients:
@@ -199,25 +267,38 @@ def _load_runtime_config():
     WHATSAPP_ENABLED = bool(_cfg("whatsapp_enabled", WHATSAPP_ENABLED))
     WHATSAPP_MIN_RISK_LEVEL = str(_cfg("whatsapp_min_risk_level", WHATSAPP_MIN_RISK_LEVEL)).lower()
     COOLDOWN_SECONDS = int(_cfg("cooldown_seconds", COOLDOWN_SECONDS))
+    EVENT_WORKER_THREADS = max(1, int(_cfg("event_worker_threads", EVENT_WORKER_THREADS)))
+    SNAPSHOT_WAIT_SECONDS = max(0.0, float(_cfg("snapshot_wait_seconds", SNAPSHOT_WAIT_SECONDS)))
+    ANALYSIS_CACHE_SECONDS = max(0, int(_cfg("analysis_cache_seconds", ANALYSIS_CACHE_SECONDS)))
+    ANALYSIS_CACHE_MAX_DISTANCE = max(0, int(_cfg("analysis_cache_max_distance", ANALYSIS_CACHE_MAX_DISTANCE)))
 
     HA_URL = str(_cfg("ha_url", HA_URL))
     _ha_token = _cfg("ha_token", HA_TOKEN)
     if not _looks_masked_secret(_ha_token):
         HA_TOKEN = str(_ha_token)
-    CAMERA_ZONE_LIGHTS = dict(_cfg("camera_zone_lights", CAMERA_ZONE_LIGHTS))
+    # Frozen to tuples once here; _action_light hands them straight to HA.
+    CAMERA_ZONE_LIGHTS = {
+        str(cam): (lights,) if isinstance(lights, str) else tuple(str(x) for x in lights)
+        for cam, lights in dict(_cfg("camera_zone_lights", CAMERA_ZONE_LIGHTS)).items()
+    }
     default_lights = _cfg("camera_zone_lights_default", CAMERA_ZONE_LIGHTS_DEFAULT)
     if isinstance(default_lights, list) and default_lights:
-        CAMERA_ZONE_LIGHTS_DEFAULT = [str(x) for x in default_lights]
+        CAMERA_ZONE_LIGHTS_DEFAULT = tuple(str(x) for x in default_lights)
     ALARM_ENTITY = str(_cfg("alarm_entity", ALARM_ENTITY))
     QUIET_HOURS_START = int(_cfg("quiet_hours_start", QUIET_HOURS_START))
     QUIET_HOURS_END = int(_cfg("quiet_hours_end", QUIET_HOURS_END))
 
     HA_HOME_MODE_ENTITY = str(_cfg("ha_home_mode_entity", HA_HOME_MODE_ENTITY))
     HA_KNOWN_FACES_ENTITY = str(_cfg("ha_known_faces_entity", HA_KNOWN_FACES_ENTITY))
+    HA_STATE_TTL_SECONDS = float(_cfg("ha_state_ttl_seconds", HA_STATE_TTL_SECONDS))
+    HA_STATESTREAM_PREFIX = str(_cfg("ha_statestream_prefix", HA_STATESTREAM_PREFIX)).strip().rstrip("/")
     EXCLUDE_KNOWN_FACES = bool(_cfg("exclude_known_faces", EXCLUDE_KNOWN_FACES))
     CAMERA_CONTEXT_NOTES = dict(_cfg("camera_context_notes", CAMERA_CONTEXT_NOTES))
-    CAMERA_POLICY_ZONES = dict(_cfg("camera_policy_zones", CAMERA_POLICY_ZONES))
-    CAMERA_POLICY_ZONE_DEFAULT = str(_cfg("camera_policy_zone_default", CAMERA_POLICY_ZONE_DEFAULT))
+    CAMERA_POLICY_ZONES = {
+        str(cam): str(zone).lower()
+        for cam, zone in dict(_cfg("camera_policy_zones", CAMERA_POLICY_ZONES)).items()
+    }
+    CAMERA_POLICY_ZONE_DEFAULT = str(_cfg("camera_policy_zone_default", CAMERA_POLICY_ZONE_DEFAULT)).lower()
     RECENT_EVENTS_WINDOW_SECONDS = int(_cfg("recent_events_window_seconds", RECENT_EVENTS_WINDOW_SECONDS))
 
     EVENT_HISTORY_FILE = Path(str(_cfg("event_history_file", str(EVENT_HISTORY_FILE))))
@@ -225,9 +306,11 @@ def _load_runtime_config():
     EVENT_HISTORY_MAX_LINES = int(_cfg("event_history_max_lines", EVENT_HISTORY_MAX_LINES))
 
     PHASE3_ENABLED = bool(_cfg("phase3_enabled", PHASE3_ENABLED))
+    PREFLIGHT_LOW_RISK_ENABLED = bool(_cfg("preflight_low_risk_enabled", PREFLIGHT_LOW_RISK_ENABLED))
     PHASE4_ENABLED = bool(_cfg("phase4_enabled", PHASE4_ENABLED))
     PHASE5_CONFIRM_ENABLED = bool(_cfg("phase5_enabled", PHASE5_CONFIRM_ENABLED))
     PHASE8_ENABLED = bool(_cfg("phase8_enabled", PHASE8_ENABLED))
+    LOG_LEVEL = str(_cfg("log_level", LOG_LEVEL)).upper()
     PHASE5_CONFIRM_DELAY_SECONDS = int(_cfg("phase5_confirm_delay_seconds", PHASE5_CONFIRM_DELAY_SECONDS))
     PHASE5_CONFIRM_TIMEOUT_SECONDS = int(_cfg("phase5_confirm_timeout_seconds", PHASE5_CONFIRM_TIMEOUT_SECONDS))
     risks = _cfg("phase5_confirm_risks", list(PHASE5_CONFIRM_RISKS))
@@ -235,34 +318,107 @@ def _load_runtime_config():
         PHASE5_CONFIRM_RISKS = {str(x).lower() for x in risks}
 
     # Optional enterprise secret overrides from .secrets.env
-    if SECRETS_ENV_FILE.exists():
-        try:
-            for ln in SECRETS_ENV_FILE.read_text(encoding="utf-8").splitlines():
-                s = ln.strip()
-                if not s or s.startswith("#") or "=" not in s:
-                    continue
-                k, v = s.split("=", 1)
-                key = k.strip()
-                val = v.strip().strip("'").strip('"')
-                if key == "FRIGATE_MQTT_PASS" and val:
-                    MQTT_PASS = val
-                elif key == "OPENCLAW_TOKEN" and val:
-                    OPENCLAW_TOKEN = val
-                elif key == "HA_TOKEN" and val:
-                    HA_TOKEN = val
-        except Exception as exc:
-            log.warning("Failed reading secrets env %s: %s", SECRETS_ENV_FILE, exc)
+    try:
+        for ln in SECRETS_ENV_FILE.read_bytes().splitlines():
+            match = _ENV_LINE_RE.match(ln)
+            if not match:
+                continue  # blank, comment, or malformed line
+            key = match.group(1).decode("ascii")
+            val = match.group(2).decode("utf-8")
+            if key == "FRIGATE_MQTT_PASS" and val:
+                MQTT_PASS = val
+            elif key == "OPENCLAW_TOKEN" and val:
+                OPENCLAW_TOKEN = val
+            elif key == "HA_TOKEN" and val:
+                HA_TOKEN = val
+    except FileNotFoundError:
+        pass
+    except Exception as exc:
+        log.warning("Failed reading secrets env %s: %s", SECRETS_ENV_FILE, exc)
 
     log.info("Loaded runtime config from %s", RUNTIME_CONFIG_FILE)
 
 
 _load_runtime_config()
+log.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+
+
+# ---------------------------------------------------------------------------
+# HTTP sessions (keep-alive + connection pooling, one per upstream service)
+# ---------------------------------------------------------------------------
+def _make_session(headers: dict | None = None, pool_maxsize: int = 16,
+                  retry: bool = True) -> requests.Session:
+    """Create a pooled session that reuses TCP/TLS connections across calls.
+
+    pool_maxsize should cover the number of threads that can hit the same host
+    at once; beyond that urllib3 opens throwaway connections. retry=False makes
+    each request a single attempt, so its timeout is the real upper bound.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        ) if retry else 0,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+SESSION_FRIGATE = _make_session()
+SESSION_HA = _make_session({
+    "Authorization": f"Bearer {HA_TOKEN}",
+    "Content-Type": "application/json",
+})
+# Service calls keep their own single explicit retry in _ha_call_service;
+# without this the adapter's connect retries would multiply it.
+SESSION_HA.mount(f"{HA_URL.rstrip('/')}/api/services/", HTTPAdapter(pool_connections=1, max_retries=0))
+# Ollama and OpenClaw only take long-timeout POSTs (fallbacks follow on
+# failure), so connect retries would just multiply the worst-case wait.
+SESSION_OLLAMA = _make_session(retry=False)
+# Analysis, confirmation, fallback and WhatsApp delivery from every event
+# worker share this pool, so size it to keep those connections warm.
+SESSION_OPENCLAW = _make_session({
+    "Authorization": f"Bearer {OPENCLAW_TOKEN}",
+    "Content-Type": "application/json",
+}, pool_maxsize=max(16, EVENT_WORKER_THREADS * 4), retry=False)
 
 # ---------------------------------------------------------------------------
 # State
 # ---------------------------------------------------------------------------
 last_alert: dict[str, float] = {}  # camera -> epoch of last alert
-recent_events: dict[str, list[float]] = {}  # camera -> list of event epochs
+recent_events: dict[str, deque] = {}  # camera -> deque of event epochs, oldest first
+_state_lock = threading.Lock()  # guards last_alert / recent_events across workers
+_ha_state_cache: dict[str, tuple[float, str | None]] = {}  # entity_id -> (fetched epoch, state)
+_ha_state_lock = threading.Lock()
+_history_rings: dict[str, deque] = {}  # camera -> deque of (epoch, row), loaded lazily
+_history_lock = threading.Lock()  # guards _history_rings and _history_summary_cache
+_history_summary_cache: dict[str, tuple[float, str]] = {}  # camera -> (built epoch, summary)
+_HISTORY_SUMMARY_TTL_SECONDS = 5.0
+_history_file_lock = threading.Lock()  # guards EVENT_HISTORY_FILE writes/trims
+_history_appends = 0
+_history_queue: queue.SimpleQueue = queue.SimpleQueue()  # JSONL lines for the writer thread; None stops it
+_history_writer_thread: threading.Thread | None = None
+_seen_events: OrderedDict[str, None] = OrderedDict()  # recent "new" event ids; paho thread only
+_SEEN_EVENTS_MAX = 512
+_analysis_cache: dict[str, deque] = {}  # camera -> deque of (epoch, fingerprint, context, event_id, analysis)
+_analysis_cache_lock = threading.Lock()
+_ANALYSIS_CACHE_PER_CAMERA = 8
+_event_executor: ThreadPoolExecutor | None = None
+_delivery_executor: ThreadPoolExecutor | None = None  # WhatsApp fan-out across recipients
+_webhook_executor: ThreadPoolExecutor | None = None  # fire-and-forget OpenClaw session kick-offs
+_action_executor: ThreadPoolExecutor | None = None  # independent HA/Frigate sub-actions
+_sessions_index_cache: dict = {"stamp": None, "data": {}}  # parsed sessions.json keyed by (mtime_ns, size)
+_sessions_index_lock = threading.Lock()
+_ollama_slots = threading.BoundedSemaphore(OLLAMA_CONCURRENCY)
+_shutdown = threading.Event()  # set on exit; timed waits return early so workers drain fast
 _bridge_lock_handle = None
 
 
@@ -285,38 +441,114 @@ def acquire_singleton_lock() -> bool:
 
 def is_on_cooldown(camera: str) -> bool:
     now = time.time()
-    if camera in last_alert and (now - last_alert[camera]) < COOLDOWN_SECONDS:
-        return True
-    last_alert[camera] = now
+    with _state_lock:
+        if camera in last_alert and (now - last_alert[camera]) < COOLDOWN_SECONDS:
+            return True
+        last_alert[camera] = now
     return False
 
 
+def _wait_for_snapshot(event_id: str, timeout: float | None = None, interval: float = 0.2) -> bool:
+    """Poll Frigate with HEAD until the event snapshot is ready.
+
+    Backs off 0.2s, 0.3s, 0.45s, ... up to SNAPSHOT_WAIT_SECONDS. Returns
+    False only when shutdown was requested; on timeout the caller still
+    attempts the download (which falls back to the thumbnail).
+    """
+    url = f"{FRIGATE_API}/api/events/{event_id}/snapshot.jpg"
+    started = time.monotonic()
+    deadline = started + (SNAPSHOT_WAIT_SECONDS if timeout is None else timeout)
+    delay = interval
+    while True:
+        try:
+            resp = SESSION_FRIGATE.head(url, timeout=2)
+            if resp.status_code == 200 and int(resp.headers.get("Content-Length") or 1001) > 1000:
+                log.debug("Snapshot for %s ready after %.2fs", event_id, time.monotonic() - started)
+                return True
+            if resp.status_code in (405, 501):
+                # HEAD not routed on this Frigate build; keep the old fixed wait.
+                return not _shutdown.wait(max(0.0, 3.0 - (time.monotonic() - started)))
+        except (requests.RequestException, ValueError) as exc:
+            log.debug("Snapshot HEAD for %s failed: %s", event_id, exc)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            log.info("Snapshot for %s not ready after %.1fs; trying download anyway",
+                     event_id, time.monotonic() - started)
+            return True
+        if _shutdown.wait(min(delay, remaining)):
+            return False
+        delay *= 1.5
+
+
 def download_snapshot(event_id: str, filename: str | None = None) -> Path | None:
-    """Download snapshot (or thumbnail fallback) from Frigate API."""
+    """Download snapshot (or thumbnail fallback) from Frigate API.
+
+    A file already saved under the same name (duplicate delivery, restart
+    mid-event) is reused without another Frigate round-trip.
+    """
     SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
     dest = SNAPSHOT_DIR / (filename or f"{event_id}.jpg")
+    try:
+        size = dest.stat().st_size
+    except FileNotFoundError:
+        size = 0
+    if size > 1000:
+        log.info("Reusing %s (%d bytes) already on disk", dest, size)
+        return dest
 
+    # Write via a .part file so an interrupted write never leaves a truncated
+    # JPEG that the reuse check above would accept.
+    part_path = dest.with_name(dest.name + ".part")
     for endpoint in ("snapshot.jpg", "thumbnail.jpg"):
         url = f"{FRIGATE_API}/api/events/{event_id}/{endpoint}"
         try:
-            resp = requests.get(url, timeout=10)
+            resp = SESSION_FRIGATE.get(url, timeout=10)
             if resp.status_code == 200 and len(resp.content) > 1000:
-                dest.write_bytes(resp.content)
+                part_path.write_bytes(resp.content)
+                os.replace(part_path, dest)
                 log.info("Saved %s (%d bytes) via %s", dest, len(resp.content), endpoint)
                 return dest
         except requests.RequestException as exc:
             log.warning("Failed to fetch %s: %s", url, exc)
+        except OSError as exc:
+            part_path.unlink(missing_ok=True)
+            log.warning("Failed to save %s: %s", dest, exc)
 
     log.error("Could not download snapshot for event %s", event_id)
     return None
 
 
+FICLONE = 0x40049409  # linux/fs.h reflink ioctl (btrfs/xfs)
+
+
+def _link_or_copy(src: Path, dest: Path) -> None:
+    """Place src at dest via hardlink, then reflink, then a plain copy."""
+    try:
+        if os.path.samefile(src, dest):
+            return  # already staged
+        dest.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dest)
+        return
+    except OSError:
+        pass  # cross-device or hardlinks not allowed
+    try:
+        with src.open("rb") as fsrc, dest.open("wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        return
+    except OSError:
+        pass
+    shutil.copyfile(src, dest)
+
+
 def stage_snapshot_for_openclaw(src: Path, event_id: str) -> Path | None:
-    """Copy snapshot into OpenClaw workspace so MEDIA:./... works."""
+    """Link snapshot into OpenClaw workspace so MEDIA:./... works."""
     try:
         OPENCLAW_MEDIA_DIR.mkdir(parents=True, exist_ok=True)
         dest = OPENCLAW_MEDIA_DIR / f"{event_id}.jpg"
-        shutil.copyfile(src, dest)
+        _link_or_copy(src, dest)
         return dest
     except Exception as exc:
         log.warning("Failed to stage snapshot for OpenClaw: %s", exc)
@@ -324,11 +556,11 @@ def stage_snapshot_for_openclaw(src: Path, event_id: str) -> Path | None:
 
 
 def stage_clip_for_openclaw(src: Path, event_id: str) -> Path | None:
-    """Copy clip into OpenClaw workspace so MEDIA:./... resolves correctly."""
+    """Link clip into OpenClaw workspace so MEDIA:./... resolves correctly."""
     try:
         OPENCLAW_CLIP_DIR.mkdir(parents=True, exist_ok=True)
         dest = OPENCLAW_CLIP_DIR / f"{event_id}.mp4"
-        shutil.copyfile(src, dest)
+        _link_or_copy(src, dest)
         return dest
     except Exception as exc:
         log.warning("Failed to stage clip for OpenClaw: %s", exc)
@@ -336,59 +568,124 @@ def stage_clip_for_openclaw(src: Path, event_id: str) -> Path | None:
 
 
 def _ha_get_state(entity_id: str) -> str | None:
+    """Read one Home Assistant entity state, served from a short TTL cache."""
+    cached = _ha_state_cache.get(entity_id)
+    if cached and (time.time() - cached[0]) < HA_STATE_TTL_SECONDS:
+        return cached[1]
+    states = _ha_get_states_bulk()
+    if states is None:
+        # Bulk read failed; try the single-entity endpoint before giving up.
+        state = _ha_fetch_state(entity_id)
+        if state is not None:
+            with _ha_state_lock:
+                _ha_state_cache[entity_id] = (time.time(), state)
+        return state
+    state = states.get(entity_id)
+    if state is None:
+        log.info("HA entity not found (optional): %s", entity_id)
+    with _ha_state_lock:
+        _ha_state_cache[entity_id] = (time.time(), state)
+    return state
+
+
+def _ha_get_states_bulk() -> dict[str, str] | None:
+    """Read every HA entity state with one /api/states call and cache them."""
+    try:
+        resp = SESSION_HA.get(f"{HA_URL}/api/states", timeout=6)
+        if resp.status_code != 200:
+            log.warning("HA bulk state read returned %d", resp.status_code)
+            return None
+        states = {
+            str(item.get("entity_id")): str(item.get("state", "")).strip()
+            for item in _json_loads(resp.content)
+            if isinstance(item, dict)
+        }
+    except (requests.RequestException, ValueError, TypeError) as exc:
+        log.warning("HA bulk state read failed: %s", exc)
+        return None
+    now = time.time()
+    with _ha_state_lock:
+        # Policy entities absent from HA are cached as missing too.
+        for entity_id in (HA_HOME_MODE_ENTITY, HA_KNOWN_FACES_ENTITY):
+            _ha_state_cache[entity_id] = (now, None)
+        for entity_id, state in states.items():
+            _ha_state_cache[entity_id] = (now, state)
+    return states
+
+
+def ha_state_invalidate(entity_id: str | None = None) -> None:
+    """Drop cached HA state for one entity (or all) after it changes."""
+    with _ha_state_lock:
+        if entity_id is None:
+            _ha_state_cache.clear()
+        else:
+            _ha_state_cache.pop(entity_id, None)
+
+
+def _ha_fetch_state(entity_id: str) -> str | None:
     """Read one Home Assistant entity state via REST API."""
     url = f"{HA_URL}/api/states/{entity_id}"
-    headers = {
-        "Authorization": f"Bearer {HA_TOKEN}",
-        "Content-Type": "application/json",
-    }
     try:
-        resp = requests.get(url, headers=headers, timeout=6)
+        resp = SESSION_HA.get(url, timeout=6)
         if resp.status_code == 200:
-            data = resp.json()
+            data = _json_loads(resp.content)
             return str(data.get("state", "")).strip()
         if resp.status_code == 404:
             log.info("HA entity not found (optional): %s", entity_id)
             return None
         log.warning("HA state read %s returned %d", entity_id, resp.status_code)
-    except requests.RequestException as exc:
+    except (requests.RequestException, ValueError) as exc:
         log.warning("HA state read %s failed: %s", entity_id, exc)
     return None
 
 
+# Local hour -> bucket: 06-17 day, 18-22 evening, 23-05 night
+_TOD_LUT = ("night",) * 6 + ("day",) * 12 + ("evening",) * 5 + ("night",)
+
+
 def _time_of_day_bucket() -> str:
-    hour = datetime.now().hour
-    if 6 <= hour < 18:
-        return "day"
-    if 18 <= hour < 23:
-        return "evening"
-    return "night"
+    return _TOD_LUT[time.localtime().tm_hour]
+
+
+def _prune_recent_events(events: deque, now: float):
+    """Drop expired epochs from the head; caller holds _state_lock."""
+    while events and now - events[0] > RECENT_EVENTS_WINDOW_SECONDS:
+        events.popleft()
 
 
 def _recent_event_snapshot(camera: str) -> tuple[int, str]:
     """Return count + last timestamp for this camera within policy window."""
     now = time.time()
-    events = recent_events.get(camera, [])
-    events = [ts for ts in events if (now - ts) <= RECENT_EVENTS_WINDOW_SECONDS]
-    recent_events[camera] = events
-    if not events:
-        return 0, "none"
-    last_dt = datetime.fromtimestamp(max(events), tz=timezone.utc).isoformat()
-    return len(events), last_dt
+    with _state_lock:
+        events = recent_events.get(camera)
+        if not events:
+            return 0, "none"
+        _prune_recent_events(events, now)
+        if not events:
+            return 0, "none"
+        count, last_ts = len(events), events[-1]
+    last_dt = datetime.fromtimestamp(last_ts, tz=timezone.utc).isoformat()
+    return count, last_dt
 
 
 def _record_event(camera: str):
     now = time.time()
-    events = recent_events.get(camera, [])
-    events.append(now)
-    recent_events[camera] = [ts for ts in events if (now - ts) <= RECENT_EVENTS_WINDOW_SECONDS]
+    with _state_lock:
+        events = recent_events.get(camera)
+        if events is None:
+            events = recent_events[camera] = deque()
+        events.append(now)
+        _prune_recent_events(events, now)
 
 
 def get_policy_context(camera: str) -> dict:
-    """Build Phase 3 policy context with HA-backed values and safe defaults."""
+    """Build Phase 3 policy context with HA-backed values and safe defaults.
+
+    String fields are lowercased here once, so consumers compare them as-is.
+    """
     home_mode = (_ha_get_state(HA_HOME_MODE_ENTITY) or "home").lower()
     known_faces_state = (_ha_get_state(HA_KNOWN_FACES_ENTITY) or "off").lower()
-    known_faces_present = known_faces_state in {"on", "true", "home", "detected"}
+    known_faces_present = known_faces_state in _KNOWN_FACES_ON_STATES
     recent_count, recent_last_ts = _recent_event_snapshot(camera)
     return {
         "time_of_day": _time_of_day_bucket(),
@@ -401,6 +698,7 @@ def get_policy_context(camera: str) -> dict:
     }
 
 
+@functools.lru_cache(maxsize=8192)
 def _parse_iso_utc(ts: str) -> datetime | None:
     if not ts:
         return None
@@ -410,44 +708,76 @@ def _parse_iso_utc(ts: str) -> datetime | None:
         return None
 
 
-def _read_recent_history(camera: str, window_seconds: int = EVENT_HISTORY_WINDOW_SECONDS) -> list[dict]:
-    """Read recent events for one camera from JSONL memory store."""
-    if not EVENT_HISTORY_FILE.exists():
-        return []
-    now = datetime.now(timezone.utc)
-    out: list[dict] = []
+def _load_history_ring(camera: str) -> deque:
+    """Seed one camera's in-memory history from the tail of the JSONL store."""
+    ring: deque = deque(maxlen=EVENT_HISTORY_MAX_LINES)
+    # Rows are written compactly, so a raw byte match skips other cameras unparsed.
+    # Older rows were written with json.dumps' default \u escapes, so match both.
+    needles = {b'"camera":' + _json_dumps_bytes(camera),
+               b'"camera":' + json.dumps(camera).encode("ascii")}
     try:
-        with EVENT_HISTORY_FILE.open("r", encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    row = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                if row.get("camera") != camera:
-                    continue
-                dt = _parse_iso_utc(str(row.get("timestamp", "")))
-                if not dt:
-                    continue
-                age = (now - dt).total_seconds()
-                if age <= window_seconds:
-                    out.append(row)
+        with EVENT_HISTORY_FILE.open("rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            start = max(0, size - 256 * EVENT_HISTORY_MAX_LINES)
+            fh.seek(start)
+            lines = fh.read().splitlines()
+    except FileNotFoundError:
+        return ring
     except Exception as exc:
         log.warning("Failed reading event history: %s", exc)
-    return out
+        return ring
+    if start > 0:
+        lines = lines[1:]  # first line is probably partial
+    for line in lines[-EVENT_HISTORY_MAX_LINES:]:
+        if not any(needle in line for needle in needles):
+            continue
+        try:
+            row = _json_loads(line)
+        except ValueError:
+            continue
+        if row.get("camera") != camera:
+            continue
+        dt = _parse_iso_utc(str(row.get("timestamp", "")))
+        if dt:
+            ring.append((dt.timestamp(), row))
+    return ring
+
+
+def _read_recent_history(camera: str, window_seconds: int = EVENT_HISTORY_WINDOW_SECONDS) -> list[dict]:
+    """Read recent events for one camera from the in-memory history ring."""
+    with _history_lock:
+        ring = _history_rings.get(camera)
+        if ring is None:
+            ring = _history_rings[camera] = _load_history_ring(camera)
+        entries = list(ring)
+    cutoff = time.time() - window_seconds
+    return [row for ts, row in entries if ts >= cutoff]
 
 
 def _recent_events_summary(camera: str) -> str:
-    """Build Phase 4 RECENT_EVENTS summary for prompt context."""
+    """Build Phase 4 RECENT_EVENTS summary for prompt context.
+
+    Reused for a few seconds per camera; append_event_history drops the
+    cached entry when it records a new row.
+    """
+    now = time.time()
+    cached = _history_summary_cache.get(camera)
+    if cached is not None and now - cached[0] < _HISTORY_SUMMARY_TTL_SECONDS:
+        return cached[1]
+    summary = _build_recent_events_summary(camera)
+    with _history_lock:
+        _history_summary_cache[camera] = (now, summary)
+    return summary
+
+
+def _build_recent_events_summary(camera: str) -> str:
     rows = _read_recent_history(camera)
     if not rows:
         return "- none in last 30 minutes"
 
     last_row = rows[-1]
     last_ts = str(last_row.get("timestamp", "unknown"))
-    high_or_critical = sum(1 for r in rows if str(r.get("risk", "")).lower() in {"high", "critical"})
+    high_or_critical = sum(1 for r in rows if str(r.get("risk", "")).lower() in _HIGH_RISKS)
     common_type = str(last_row.get("type", "other"))
     return (
         f"- {len(rows)} events in last 30 minutes ({camera})\n"
@@ -458,21 +788,71 @@ def _recent_events_summary(camera: str) -> str:
 
 
 def _trim_event_history() -> None:
-    """Keep memory file bounded to last N lines."""
+    """Keep memory file bounded to last N lines (streamed copy + atomic replace)."""
     try:
-        lines = EVENT_HISTORY_FILE.read_text(encoding="utf-8").splitlines()
-        if len(lines) <= EVENT_HISTORY_MAX_LINES:
+        with EVENT_HISTORY_FILE.open("rb") as fh:
+            total = sum(1 for _ in fh)
+        skip = total - EVENT_HISTORY_MAX_LINES
+        if skip <= 0:
             return
-        trimmed = "\n".join(lines[-EVENT_HISTORY_MAX_LINES:]) + "\n"
-        EVENT_HISTORY_FILE.write_text(trimmed, encoding="utf-8")
+        tmp = EVENT_HISTORY_FILE.with_name(EVENT_HISTORY_FILE.name + ".tmp")
+        with EVENT_HISTORY_FILE.open("rb") as src, tmp.open("wb") as dst:
+            for _ in range(skip):
+                src.readline()
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp, EVENT_HISTORY_FILE)
     except Exception as exc:
         log.warning("Failed trimming event history: %s", exc)
 
 
+def _write_event_history(data: bytes, rows: int) -> None:
+    """Append JSONL rows to the history file, trimming it periodically."""
+    global _history_appends
+    with _history_file_lock:
+        try:
+            EVENT_HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with EVENT_HISTORY_FILE.open("ab") as fh:
+                fh.write(data)
+            # Trim on the first write after startup, then every N appends.
+            before = _history_appends
+            _history_appends += rows
+            if before == 0 or before // EVENT_HISTORY_TRIM_EVERY != _history_appends // EVENT_HISTORY_TRIM_EVERY:
+                _trim_event_history()
+        except Exception as exc:
+            log.warning("Failed writing event history: %s", exc)
+
+
+def _history_writer() -> None:
+    """Drain queued history lines to disk, batching whatever has piled up."""
+    while True:
+        line = _history_queue.get()
+        if line is None:
+            return
+        lines = [line]
+        stop = False
+        while True:
+            try:
+                line = _history_queue.get_nowait()
+            except queue.Empty:
+                break
+            if line is None:
+                stop = True
+                break
+            lines.append(line)
+        _write_event_history(b"".join(lines), len(lines))
+        if stop:
+            return
+
+
 def append_event_history(camera: str, event_id: str, decision: dict) -> None:
-    """Append one decision event to Phase 4 JSONL memory store."""
+    """Append one decision event to Phase 4 JSONL memory store.
+
+    The in-memory ring is updated immediately; the file write is handed to
+    the history writer thread when it is running.
+    """
+    now = datetime.now(timezone.utc)
     row = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": now.isoformat(),
         "camera": camera,
         "event_id": event_id,
         "risk": str(decision.get("risk", "low")),
@@ -480,49 +860,72 @@ def append_event_history(camera: str, event_id: str, decision: dict) -> None:
         "type": str(decision.get("type", "other")),
         "confidence": float(decision.get("confidence", 0.0)),
     }
-    try:
-        EVENT_HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with EVENT_HISTORY_FILE.open("a", encoding="utf-8") as fh:
-            fh.write(json.dumps(row, separators=(",", ":")) + "\n")
-        _trim_event_history()
-    except Exception as exc:
-        log.warning("Failed writing event history: %s", exc)
+    with _history_lock:
+        ring = _history_rings.get(camera)
+        if ring is not None:
+            ring.append((now.timestamp(), row))
+        _history_summary_cache.pop(camera, None)
+    line = _json_dumps_bytes(row) + b"\n"
+    if _history_writer_thread is None:
+        _write_event_history(line, 1)
+    else:
+        _history_queue.put(line)
 
 
 
 # ---------------------------------------------------------------------------
 # Pillar 2 — Rule-based severity scoring (supplements AI decision)
 # ---------------------------------------------------------------------------
+_SUSPICIOUS_BEHAVIOR_RE = re.compile(r"suspicious|lurking|forcing|climbing|breaking|running|prying")
+_COVERT_BEHAVIOR_RE = re.compile(r"crouching|hiding|concealing|tampering")
+_ROUTINE_BEHAVIOR_RE = re.compile(r"walking|standing|routine|normal|passing")
+_AFTER_HOURS = frozenset(("evening", "night"))
+_HOME_MODE_SCORE = {"away": 3, "sleep": 1}
+_AI_RISK_SCORE = {"low": 0, "medium": 3, "high": 5, "critical": 7}
+# Score -> risk level, indexed by the score clamped to 0..7 (0-2 low, 3-4 medium, 5-6 high, 7+ critical)
+_SCORE_LEVELS = ("low", "low", "low", "medium", "medium", "high", "high", "critical")
+
+
+def _normalize_ai_decision(d: dict) -> dict:
+    """Return the scoring view of an AI decision: risk resolved to a level
+    string and type/behavior lowercased. The original decision keeps its case
+    for display."""
+    risk_val = d.get("risk")
+    if isinstance(risk_val, dict):
+        risk_val = risk_val.get("level")
+    return {
+        "risk": str(risk_val or "low").lower(),
+        "type": str(d.get("type", "other")).lower(),
+        "behavior": str(d.get("behavior", "")).lower(),
+    }
+
+
 def score_severity(ai_decision: dict, policy: dict) -> str:
     """Apply deterministic rules to adjust AI risk assessment.
     Rules only UPGRADE risk, never downgrade unless known face.
+    Expects a policy from get_policy_context (already lowercased).
     Returns: low / medium / high / critical."""
-    score = 0
-    ai_risk = str(ai_decision.get("risk", {}) if not isinstance(ai_decision.get("risk"), dict) else ai_decision.get("risk", {}).get("level", "low")).lower()
-    ai_type = str(ai_decision.get("type", "other")).lower()
-    time_of_day = str(policy.get("time_of_day", "day")).lower()
-    home_mode = str(policy.get("home_mode", "home")).lower()
+    norm = _normalize_ai_decision(ai_decision)
+    ai_risk = norm["risk"]
+    ai_type = norm["type"]
+    behavior = norm["behavior"]
+    time_of_day = policy.get("time_of_day", "day")
+    home_mode = policy.get("home_mode", "home")
     known_faces = bool(policy.get("known_faces_present", False))
-    zone = str(policy.get("camera_zone", "entry")).lower()
     recent_count = int(policy.get("recent_events_count", 0))
-    behavior = str(ai_decision.get("behavior", "")).lower()
 
     # Start from AI risk as baseline (trust the AI, rules only adjust)
-    ai_score = {"low": 0, "medium": 3, "high": 5, "critical": 7}.get(ai_risk, 0)
-    score = ai_score
+    score = _AI_RISK_SCORE.get(ai_risk, 0)
 
     # After hours (evening/night) — significant risk multiplier
-    if time_of_day in ("evening", "night"):
+    if time_of_day in _AFTER_HOURS:
         score += 2
-    # Away mode = highest contextual risk
-    if home_mode == "away":
-        score += 3
-    elif home_mode == "sleep":
-        score += 1
+    # Away mode = highest contextual risk, sleep = mild
+    score += _HOME_MODE_SCORE.get(home_mode, 0)
     # Highly suspicious behavior keywords
-    if any(w in behavior for w in ("suspicious", "lurking", "forcing", "climbing", "breaking", "running", "prying")):
+    if _SUSPICIOUS_BEHAVIOR_RE.search(behavior):
         score += 3
-    elif any(w in behavior for w in ("crouching", "hiding", "concealing", "tampering")):
+    elif _COVERT_BEHAVIOR_RE.search(behavior):
         score += 2
     # Loitering is concerning
     if "loitering" in ai_type:
@@ -534,82 +937,214 @@ def score_severity(ai_decision: dict, policy: dict) -> str:
     if "delivery" in ai_type:
         score -= 2
     # Routine behavior words = mild reduction (walking, standing, normal)
-    if any(w in behavior for w in ("walking", "standing", "routine", "normal", "passing")):
+    if _ROUTINE_BEHAVIOR_RE.search(behavior):
         score -= 1
     # Frequent recent events = something ongoing
     if recent_count >= 5:
         score += 1
 
     # Map score to risk level
-    if score <= 2:
+    return _SCORE_LEVELS[min(max(score, 0), len(_SCORE_LEVELS) - 1)]
+
+
+def _preflight_risk(policy: dict) -> str | None:
+    """Return "low" when policy alone rules out a threat, else None (run the VLM)."""
+    if (
+        policy.get("home_mode") == "home"
+        and policy.get("known_faces_present")
+        and policy.get("time_of_day") == "day"
+        and policy.get("recent_events_count", 0) == 0
+    ):
         return "low"
-    elif score <= 4:
-        return "medium"
-    elif score <= 6:
-        return "high"
-    else:
-        return "critical"
+    return None
+
+
+_MEDIA_BY_RISK = {
+    "low":      {"snapshot": True,  "clip": False, "clip_length": 0,  "monitoring": False},
+    "medium":   {"snapshot": True,  "clip": True,  "clip_length": 15, "monitoring": False},
+    "high":     {"snapshot": True,  "clip": True,  "clip_length": 30, "monitoring": True},
+    "critical": {"snapshot": True,  "clip": True,  "clip_length": 60, "monitoring": True},
+}
+_MEDIA_DEFAULT = {"snapshot": True, "clip": False, "clip_length": 0, "monitoring": False}
 
 
 def decide_media(risk_level: str) -> dict:
     """Decide what media to attach based on risk level."""
-    return {
-        "low":      {"snapshot": True,  "clip": False, "clip_length": 0,  "monitoring": False},
-        "medium":   {"snapshot": True,  "clip": True,  "clip_length": 15, "monitoring": False},
-        "high":     {"snapshot": True,  "clip": True,  "clip_length": 30, "monitoring": True},
-        "critical": {"snapshot": True,  "clip": True,  "clip_length": 60, "monitoring": True},
-    }.get(risk_level, {"snapshot": True, "clip": False, "clip_length": 0, "monitoring": False})
+    return dict(_MEDIA_BY_RISK.get(risk_level, _MEDIA_DEFAULT))
+
+
+# Prompt templates are built once; the hot path only fills them via format_map.
+# Literal JSON braces are doubled.
+_OLLAMA_PROMPT_TEMPLATE = (
+    "You are an AI security camera analyst. Analyze this image from camera '{camera}'.\n"
+    "Location: {camera_context}\n"
+    "Zone: {camera_zone}\n"
+    "Time: {time_of_day}, Home: {home_mode}\n"
+    "Known faces: {known_faces}\n\n"
+    "Describe EXACTLY what you see. Be specific about:\n"
+    "- Number of people, clothing, build, distinguishing features\n"
+    "- Actions: walking, standing, reaching, looking around, carrying items\n"
+    "- Items: bags, tools, packages, phone, nothing\n"
+    "- Is behavior normal or suspicious for this location?\n\n"
+    "Then output a JSON block. Start the line with JSON: and put the entire object on ONE line.\n"
+    "JSON: {{"
+    '"subject":{{"identity":"unknown","description":"brief appearance"}},'
+    '"behavior":"what they are doing",'
+    '"risk":{{"level":"low|medium|high|critical","confidence":0.0,"reason":"why"}},'
+    '"type":"unknown_person|known_person|delivery|vehicle|animal|loitering|other",'
+    '"action":"notify_only|notify_and_save_clip|notify_and_light|notify_and_alarm"'
+    "}}\n\n"
+    "Rules: low=routine, medium=unusual activity, high=suspicious/after-hours, critical=threat/break-in.\n"
+    "Match action to risk: low->notify_only, medium->notify_and_save_clip, high->notify_and_light, critical->notify_and_alarm."
+)
+
+_OPENCLAW_PROMPT_TEMPLATE = (
+    "Security alert from camera '{camera}'. "
+    "Use the image tool to open and analyze the snapshot at: {media_abs}\n\n"
+    "Policy context for this event:\n"
+    "- time_of_day: {time_of_day}\n"
+    "- home_mode: {home_mode}\n"
+    "- known_faces_present: {known_faces}\n"
+    "- camera_context: {camera_context}\n"
+    "- camera_zone: {camera_zone}\n"
+    "- recent_events: {recent_events_count} in last 10 minutes "
+    "(last={recent_events_last_ts})\n\n"
+    "RECENT_EVENTS:\n"
+    "{recent_events_summary}\n\n"
+    "IMPORTANT: You CAN and MUST use the image tool to view the snapshot. "
+    "Do NOT say you cannot analyze the image — you have the image tool available. "
+    "Open the image first, then respond.\n\n"
+    "After viewing the image, your reply MUST have exactly three parts:\n\n"
+    "PART 1 — Send the snapshot image using this exact line:\n"
+    "MEDIA:{media_rel}\n\n"
+    "PART 2 — Below the MEDIA line, provide a brief security assessment:\n"
+    "[{camera}] Threat: LOW/MEDIUM/HIGH/CRITICAL\n"
+    "Description of what you see. Recommended action if any.\n\n"
+    "PART 3 — End your response with a JSON decision block on a SINGLE line:\n"
+    "JSON:\n"
+    '{{"risk":"low|medium|high|critical","type":"unknown_person|known_person|delivery|vehicle|animal|loitering|other",'
+    '"confidence":0.00,"action":"notify_only|notify_and_save_clip|notify_and_light|notify_and_alarm",'
+    '"reason":"short explanation under 120 chars"}}\n\n'
+    "Action mapping: low→notify_only, medium→notify_and_save_clip, high→notify_and_light, critical→notify_and_alarm\n\n"
+    "Rules:\n"
+    "- 3-5 sentences max for the human-readable part\n"
+    "- Be factual and direct, no questions or disclaimers\n"
+    "- Do NOT ask the user anything, just report what you see\n"
+    "- Always include the MEDIA line BEFORE the text analysis\n"
+    "- The JSON: line MUST be the last line of your response"
+)
+
+
+_STREAM_JSON_MARKER_RE = re.compile(r"(?im)^\s*json:")
+
+
+def _json_object_end(text: str, start: int) -> int | None:
+    """Return the index just past the balanced {...} starting at text[start], or None."""
+    depth = 0
+    in_str = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+
+def _read_ollama_stream(resp) -> str:
+    """Assemble a streamed /api/generate reply, stopping once the JSON: block closes.
+
+    The decision block is the last thing the prompt asks for, so anything the
+    model generates after it is dropped; closing the response early also lets
+    Ollama abort the remaining generation.
+    """
+    parts: list[str] = []
+    marker_end = -1
+    brace_at = -1
+    for line in resp.iter_lines():
+        if not line:
+            continue
+        chunk = _json_loads(line)
+        piece = chunk.get("response", "")
+        if piece:
+            parts.append(piece)
+            # Only re-join the (short) buffer when this piece can change the outcome.
+            if marker_end < 0 and ":" in piece:
+                marker = _STREAM_JSON_MARKER_RE.search("".join(parts))
+                if marker:
+                    marker_end = marker.end()
+            if marker_end >= 0 and brace_at < 0:
+                brace_at = "".join(parts).find("{", marker_end)
+            if brace_at >= 0 and "}" in piece:
+                text = "".join(parts)
+                end = _json_object_end(text, brace_at)
+                if end is not None:
+                    log.debug("Ollama decision block complete after %d chunks; closing stream", len(parts))
+                    resp.close()
+                    return text[:end]
+        if chunk.get("done"):
+            break
+    return "".join(parts)
 
 
 def _send_to_ollama_direct(camera: str, event_id: str, policy: dict, recent_events_summary: str) -> str | None:
     """Direct local VLM analysis via Mac Ollama API to avoid OpenClaw session polling issues."""
     img_path = OPENCLAW_MEDIA_DIR / f"{event_id}.jpg"
-    if not img_path.exists():
+    try:
+        # Encode straight from the page cache; no intermediate bytes/str copies.
+        with img_path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            b64 = base64.b64encode(mm)
+    except FileNotFoundError:
         log.warning("Ollama direct analysis skipped: missing staged image %s", img_path)
         return None
-    try:
-        b64 = base64.b64encode(img_path.read_bytes()).decode("ascii")
     except Exception as exc:
         log.warning("Ollama direct analysis skipped: failed to read image %s", exc)
         return None
 
-    prompt = (
-        f"You are an AI security camera analyst. Analyze this image from camera '{camera}'.\n"
-        f"Location: {policy.get('camera_context', 'unspecified')}\n"
-        f"Zone: {policy.get('camera_zone', 'entry')}\n"
-        f"Time: {policy.get('time_of_day', 'unknown')}, Home: {policy.get('home_mode', 'unknown')}\n"
-        f"Known faces: {str(policy.get('known_faces_present', False)).lower()}\n\n"
-        "Describe EXACTLY what you see. Be specific about:\n"
-        "- Number of people, clothing, build, distinguishing features\n"
-        "- Actions: walking, standing, reaching, looking around, carrying items\n"
-        "- Items: bags, tools, packages, phone, nothing\n"
-        "- Is behavior normal or suspicious for this location?\n\n"
-        "Then output a JSON block. Start the line with JSON: and put the entire object on ONE line.\n"
-        "JSON: {"
-        '"subject":{"identity":"unknown","description":"brief appearance"},'
-        '"behavior":"what they are doing",'
-        '"risk":{"level":"low|medium|high|critical","confidence":0.0,"reason":"why"},'
-        '"type":"unknown_person|known_person|delivery|vehicle|animal|loitering|other",'
-        '"action":"notify_only|notify_and_save_clip|notify_and_light|notify_and_alarm"'
-        "}\n\n"
-        "Rules: low=routine, medium=unusual activity, high=suspicious/after-hours, critical=threat/break-in.\n"
-        "Match action to risk: low->notify_only, medium->notify_and_save_clip, high->notify_and_light, critical->notify_and_alarm."
-    )
+    prompt = _OLLAMA_PROMPT_TEMPLATE.format_map({
+        "camera": camera,
+        "camera_context": policy.get("camera_context", "unspecified"),
+        "camera_zone": policy.get("camera_zone", "entry"),
+        "time_of_day": policy.get("time_of_day", "unknown"),
+        "home_mode": policy.get("home_mode", "unknown"),
+        "known_faces": str(policy.get("known_faces_present", False)).lower(),
+    })
 
     payload = {
         "model": OLLAMA_MODEL,
         "prompt": prompt,
-        "images": [b64],
-        "stream": False,
+        "stream": True,
         "options": {"num_predict": 350, "temperature": 0.1}
     }
+    # Splice the base64 image into the serialized JSON instead of letting
+    # json.dumps re-scan and copy a multi-megabyte string.
+    head = _json_dumps_bytes(payload)
+    body = b"".join((head[:-1], b',"images":["', b64, b'"]}'))
     try:
-        resp = requests.post(f"{OLLAMA_API.rstrip('/')}/api/generate", json=payload, timeout=300)
-        if resp.status_code != 200:
-            log.warning("Ollama direct analysis returned %d: %s", resp.status_code, resp.text[:200])
-            return None
-        data = resp.json()
-        out = str(data.get("response", "")).strip()
+        # Payload prep above runs in parallel; only the inference call is bounded.
+        with _ollama_slots, SESSION_OLLAMA.post(
+            f"{OLLAMA_API.rstrip('/')}/api/generate",
+            data=body,
+            headers={"Content-Type": "application/json"},
+            timeout=300,
+            stream=True,
+        ) as resp:
+            if resp.status_code != 200:
+                log.warning("Ollama direct analysis returned %d: %s", resp.status_code, resp.text[:200])
+                return None
+            out = _read_ollama_stream(resp).strip()
         if out:
             log.info("Ollama direct analysis completed via %s model=%s", OLLAMA_API, OLLAMA_MODEL)
             return out
@@ -618,6 +1153,59 @@ def _send_to_ollama_direct(camera: str, event_id: str, policy: dict, recent_even
     return None
 
 
+def _openclaw_body(message_json: bytes, **fields) -> bytes:
+    """Build a webhook JSON body around an already-encoded message string, so a
+    large prompt is encoded once and reused by the fallback request."""
+    return b'{"message":' + message_json + b"," + _json_dumps_bytes(fields)[1:]
+
+
+def _snapshot_fingerprint(path: Path):
+    """Perceptual hash of the snapshot when imagehash is installed, otherwise an
+    exact content digest. Returns None if the image cannot be read."""
+    try:
+        if imagehash is not None:
+            with Image.open(path) as img:
+                return imagehash.phash(img)
+        return hashlib.blake2b(path.read_bytes(), digest_size=16).digest()
+    except Exception as exc:
+        log.debug("Snapshot fingerprint failed for %s: %s", path, exc)
+        return None
+
+
+def _fingerprints_match(a, b) -> bool:
+    if isinstance(a, bytes) or isinstance(b, bytes):
+        return a == b
+    return a - b <= ANALYSIS_CACHE_MAX_DISTANCE
+
+
+def _cached_analysis(camera: str, event_id: str, fingerprint, context: tuple) -> str | None:
+    """Return a recent analysis for a matching snapshot on the same camera,
+    retagged with the new event id."""
+    if fingerprint is None:
+        return None
+    cutoff = time.time() - ANALYSIS_CACHE_SECONDS
+    with _analysis_cache_lock:
+        entries = _analysis_cache.get(camera)
+        if not entries:
+            return None
+        while entries and entries[0][0] < cutoff:
+            entries.popleft()
+        for _, cached_fp, cached_ctx, cached_event_id, analysis in reversed(entries):
+            if cached_ctx == context and _fingerprints_match(fingerprint, cached_fp):
+                return analysis.replace(cached_event_id, event_id)
+    return None
+
+
+def _remember_analysis(camera: str, event_id: str, fingerprint, context: tuple, analysis: str | None) -> None:
+    if fingerprint is None or not analysis:
+        return
+    with _analysis_cache_lock:
+        entries = _analysis_cache.get(camera)
+        if entries is None:
+            entries = _analysis_cache[camera] = deque(maxlen=_ANALYSIS_CACHE_PER_CAMERA)
+        entries.append((time.time(), fingerprint, context, event_id, analysis))
+
+
 def send_to_openclaw(camera: str, event_id: str, policy: dict | None = None,
                      recent_events_summary: str | None = None) -> str | None:
     """POST the snapshot to OpenClaw webhook for GPT-4o-mini vision analysis.
@@ -641,72 +1229,55 @@ def send_to_openclaw(camera: str, event_id: str, policy: dict | None = None,
     if recent_events_summary is None:
         recent_events_summary = "- none in last 30 minutes"
 
-    prompt = (
-        f"Security alert from camera '{camera}'. "
-        f"Use the image tool to open and analyze the snapshot at: {openclaw_abs_media}\n\n"
-        "Policy context for this event:\n"
-        f"- time_of_day: {policy['time_of_day']}\n"
-        f"- home_mode: {policy['home_mode']}\n"
-        f"- known_faces_present: {str(policy['known_faces_present']).lower()}\n"
-        f"- camera_context: {policy.get('camera_context', 'unspecified')}\n"
-        f"- camera_zone: {policy['camera_zone']}\n"
-        f"- recent_events: {policy['recent_events_count']} in last 10 minutes "
-        f"(last={policy['recent_events_last_ts']})\n\n"
-        "RECENT_EVENTS:\n"
-        f"{recent_events_summary}\n\n"
-        "IMPORTANT: You CAN and MUST use the image tool to view the snapshot. "
-        "Do NOT say you cannot analyze the image — you have the image tool available. "
-        "Open the image first, then respond.\n\n"
-        "After viewing the image, your reply MUST have exactly three parts:\n\n"
-        "PART 1 — Send the snapshot image using this exact line:\n"
-        f"MEDIA:{openclaw_rel_media}\n\n"
-        "PART 2 — Below the MEDIA line, provide a brief security assessment:\n"
-        f"[{camera}] Threat: LOW/MEDIUM/HIGH/CRITICAL\n"
-        "Description of what you see. Recommended action if any.\n\n"
-        "PART 3 — End your response with a JSON decision block on a SINGLE line:\n"
-        "JSON:\n"
-        '{"risk":"low|medium|high|critical","type":"unknown_person|known_person|delivery|vehicle|animal|loitering|other",'
-        '"confidence":0.00,"action":"notify_only|notify_and_save_clip|notify_and_light|notify_and_alarm",'
-        '"reason":"short explanation under 120 chars"}\n\n'
-        "Action mapping: low→notify_only, medium→notify_and_save_clip, high→notify_and_light, critical→notify_and_alarm\n\n"
-        "Rules:\n"
-        "- 3-5 sentences max for the human-readable part\n"
-        "- Be factual and direct, no questions or disclaimers\n"
-        "- Do NOT ask the user anything, just report what you see\n"
-        "- Always include the MEDIA line BEFORE the text analysis\n"
-        "- The JSON: line MUST be the last line of your response"
-    )
+    # Bursts of events from a static scene produce near-identical snapshots;
+    # skip the VLM round trip when this camera just analysed the same view.
+    fingerprint = None
+    cache_context = (policy.get("home_mode"), policy.get("known_faces_present"))
+    if ANALYSIS_CACHE_SECONDS > 0:
+        fingerprint = _snapshot_fingerprint(OPENCLAW_MEDIA_DIR / f"{event_id}.jpg")
+        cached = _cached_analysis(camera, event_id, fingerprint, cache_context)
+        if cached:
+            log.info("Reusing analysis of a near-identical %s snapshot for event %s", camera, event_id)
+            return cached
 
     # Prefer direct Ollama (Mac mini) for local VLM reasoning; keep OpenClaw path as fallback.
     analysis = _send_to_ollama_direct(camera, event_id, policy, recent_events_summary)
-
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {OPENCLAW_TOKEN}",
-    }
-
     if analysis:
+        _remember_analysis(camera, event_id, fingerprint, cache_context, analysis)
         return analysis
 
+    prompt = _OPENCLAW_PROMPT_TEMPLATE.format_map({
+        "camera": camera,
+        "media_abs": openclaw_abs_media,
+        "media_rel": openclaw_rel_media,
+        "time_of_day": policy["time_of_day"],
+        "home_mode": policy["home_mode"],
+        "known_faces": str(policy["known_faces_present"]).lower(),
+        "camera_context": policy.get("camera_context", "unspecified"),
+        "camera_zone": policy["camera_zone"],
+        "recent_events_count": policy["recent_events_count"],
+        "recent_events_last_ts": policy["recent_events_last_ts"],
+        "recent_events_summary": recent_events_summary,
+    })
     analysis = None
-    payload = {
-        "message": prompt,
-        "model": OPENCLAW_ANALYSIS_MODEL,
-        "deliver": False,
-        "sessionKey": f"frigate:{camera}:{event_id}",
-        "timeoutSeconds": 120,
-    }
+    message_json = _json_dumps_bytes(prompt)
     try:
-        resp = requests.post(
+        resp = SESSION_OPENCLAW.post(
             OPENCLAW_ANALYSIS_WEBHOOK,
-            json=payload,
-            headers=headers,
+            data=_openclaw_body(
+                message_json,
+                model=OPENCLAW_ANALYSIS_MODEL,
+                deliver=False,
+                sessionKey=f"frigate:{camera}:{event_id}",
+                timeoutSeconds=120,
+            ),
             timeout=90,
         )
         if resp.status_code in (200, 201, 202):
-            data = resp.json() if resp.headers.get("content-type", "").startswith("application/json") else {}
+            data = _json_loads(resp.content) if resp.headers.get("content-type", "").startswith("application/json") else {}
             result = data.get("reply") or data.get("response") or data.get("message", "")
-            log.info("OpenClaw analysis request accepted (%d): %s", resp.status_code, result[:120])
+            if log.isEnabledFor(logging.INFO):
+                log.info("OpenClaw analysis request accepted (%d): %s", resp.status_code, result[:120])
             if result:
                 analysis = result
         else:
@@ -723,14 +1294,16 @@ def send_to_openclaw(camera: str, event_id: str, policy: dict | None = None,
     # Fallback path: local OpenClaw + OpenAI model when primary does not yield a session
     if not analysis and OPENCLAW_ANALYSIS_WEBHOOK_FALLBACK and OPENCLAW_ANALYSIS_MODEL_FALLBACK:
         fallback_key = f"{session_key}:fallback"
-        fb_payload = dict(payload)
-        fb_payload["model"] = OPENCLAW_ANALYSIS_MODEL_FALLBACK
-        fb_payload["sessionKey"] = fallback_key
         try:
-            fb_resp = requests.post(
+            fb_resp = SESSION_OPENCLAW.post(
                 OPENCLAW_ANALYSIS_WEBHOOK_FALLBACK,
-                json=fb_payload,
-                headers=headers,
+                data=_openclaw_body(
+                    message_json,
+                    model=OPENCLAW_ANALYSIS_MODEL_FALLBACK,
+                    deliver=False,
+                    sessionKey=fallback_key,
+                    timeoutSeconds=120,
+                ),
                 timeout=90,
             )
             if fb_resp.status_code in (200, 201, 202):
@@ -747,6 +1320,7 @@ def send_to_openclaw(camera: str, event_id: str, policy: dict | None = None,
         except requests.RequestException as exc:
             log.error("Fallback analysis request failed: %s", exc)
 
+    _remember_analysis(camera, event_id, fingerprint, cache_context, analysis)
     return analysis
 
 
@@ -761,7 +1335,7 @@ def send_confirmation_to_openclaw(camera: str, event_id: str, media_event_id: st
         "Use the image tool before answering.\n"
         f"MEDIA:{openclaw_rel_media}\n\n"
         "Initial decision from first pass:\n"
-        f'{json.dumps(initial_decision, separators=(",", ":"))}\n\n'
+        f'{_json_dumps_bytes(initial_decision).decode("utf-8")}\n\n'
         "Policy context:\n"
         f"- time_of_day: {policy['time_of_day']}\n"
         f"- home_mode: {policy['home_mode']}\n"
@@ -776,49 +1350,59 @@ def send_confirmation_to_openclaw(camera: str, event_id: str, media_event_id: st
         'CONFIRM_JSON: {"confirmed":true|false,"risk":"low|medium|high|critical","action":"notify_only|notify_and_save_clip|notify_and_light|notify_and_alarm","reason":"short reason"}'
     )
 
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {OPENCLAW_TOKEN}",
-    }
-    payload = {
-        "message": prompt,
-        "model": OPENCLAW_ANALYSIS_MODEL,
-        "deliver": False,
-        "sessionKey": f"frigate:confirm:{camera}:{event_id}",
-        "timeoutSeconds": PHASE5_CONFIRM_TIMEOUT_SECONDS,
-    }
-    try:
-        resp = requests.post(
-            OPENCLAW_ANALYSIS_WEBHOOK,
-            json=payload,
-            headers=headers,
-            timeout=90,
-        )
-        if resp.status_code not in (200, 201, 202):
-            log.warning("Phase 5 confirm request returned %d: %s", resp.status_code, resp.text[:200])
-    except requests.RequestException as exc:
-        log.warning("Phase 5 confirm request failed: %s", exc)
-        return None
-
+    message_json = _json_dumps_bytes(prompt)
     confirm_key = f"frigate:confirm:{camera}:{event_id}"
-    confirm_result = read_openclaw_session_reply(
-        confirm_key,
-        timeout_seconds=PHASE5_CONFIRM_TIMEOUT_SECONDS,
-    )
+    post_failed = threading.Event()
+
+    def _kick_off_confirm() -> None:
+        try:
+            resp = SESSION_OPENCLAW.post(
+                OPENCLAW_ANALYSIS_WEBHOOK,
+                data=_openclaw_body(
+                    message_json,
+                    model=OPENCLAW_ANALYSIS_MODEL,
+                    deliver=False,
+                    sessionKey=confirm_key,
+                    timeoutSeconds=PHASE5_CONFIRM_TIMEOUT_SECONDS,
+                ),
+                timeout=90,
+            )
+            if resp.status_code not in (200, 201, 202):
+                log.warning("Phase 5 confirm request returned %d: %s", resp.status_code, resp.text[:200])
+                post_failed.set()
+        except requests.RequestException as exc:
+            log.warning("Phase 5 confirm request failed: %s", exc)
+            post_failed.set()
+
+    # The POST only starts the session; the reply arrives via the session log.
+    # Watch the log while the POST is in flight and stop early if it fails.
+    if _webhook_executor is None:
+        _kick_off_confirm()
+    else:
+        _webhook_executor.submit(_kick_off_confirm)
+    confirm_result = None
+    if not post_failed.is_set():
+        confirm_result = read_openclaw_session_reply(
+            confirm_key,
+            timeout_seconds=PHASE5_CONFIRM_TIMEOUT_SECONDS,
+            cancel=post_failed,
+        )
     if confirm_result:
         return confirm_result
 
     # Fallback confirm path when primary did not yield a session
     if OPENCLAW_ANALYSIS_WEBHOOK_FALLBACK and OPENCLAW_ANALYSIS_MODEL_FALLBACK:
         fb_key = f"{confirm_key}:fallback"
-        fb_payload = dict(payload)
-        fb_payload["model"] = OPENCLAW_ANALYSIS_MODEL_FALLBACK
-        fb_payload["sessionKey"] = fb_key
         try:
-            fb_resp = requests.post(
+            fb_resp = SESSION_OPENCLAW.post(
                 OPENCLAW_ANALYSIS_WEBHOOK_FALLBACK,
-                json=fb_payload,
-                headers=headers,
+                data=_openclaw_body(
+                    message_json,
+                    model=OPENCLAW_ANALYSIS_MODEL_FALLBACK,
+                    deliver=False,
+                    sessionKey=fb_key,
+                    timeoutSeconds=PHASE5_CONFIRM_TIMEOUT_SECONDS,
+                ),
                 timeout=90,
             )
             if fb_resp.status_code in (200, 201, 202):
@@ -840,25 +1424,37 @@ def parse_confirmation_json(analysis: str) -> dict | None:
     """Parse CONFIRM_JSON line (same-line or next-line JSON)."""
     if not analysis:
         return None
-    lines = analysis.splitlines()
+    # The marker is normally near the end; split only from its line onward and
+    # fall back to the whole text for lower-case or unmatched variants.
+    pos = analysis.rfind("CONFIRM_JSON")
+    if pos >= 0:
+        start = analysis.rfind("\n", 0, pos) + 1
+        found, obj = _scan_confirmation_lines(analysis[start:].splitlines())
+        if found:
+            return obj
+    return _scan_confirmation_lines(analysis.splitlines())[1]
+
+
+def _scan_confirmation_lines(lines: list[str]) -> tuple[bool, dict | None]:
+    """Return (marker found, parsed object) for the last CONFIRM_JSON line."""
     for i in range(len(lines) - 1, -1, -1):
         stripped = lines[i].strip()
-        match = re.match(r"(?i)^confirm_json:\s*(.*)", stripped)
+        match = _CONFIRM_JSON_LINE_RE.match(stripped)
         if not match:
             continue
         json_str = match.group(1).strip()
         if not json_str and i + 1 < len(lines):
             json_str = lines[i + 1].strip()
         if not json_str:
-            return None
+            return True, None
         try:
-            obj = json.loads(json_str)
-        except json.JSONDecodeError:
-            return None
+            obj = _json_loads(json_str)
+        except ValueError:
+            return True, None
         if "confirmed" not in obj:
-            return None
-        return obj
-    return None
+            return True, None
+        return True, obj
+    return False, None
 
 
 def maybe_confirm_decision(camera: str, event_id: str, decision: dict, policy: dict,
@@ -869,7 +1465,8 @@ def maybe_confirm_decision(camera: str, event_id: str, decision: dict, policy: d
         return decision, ""
 
     log.info("Phase 5 confirmation started for %s (risk=%s)", event_id, risk)
-    time.sleep(PHASE5_CONFIRM_DELAY_SECONDS)
+    if _shutdown.wait(PHASE5_CONFIRM_DELAY_SECONDS):
+        return decision, ""
 
     confirm_media_id = f"{event_id}-confirm"
     confirm_snapshot = download_snapshot(event_id, filename=f"{confirm_media_id}.jpg")
@@ -896,8 +1493,8 @@ def maybe_confirm_decision(camera: str, event_id: str, decision: dict, policy: d
     confirmed = bool(confirm_obj.get("confirmed"))
     if not confirmed:
         downgraded = dict(decision)
-        downgraded["risk"] = "medium" if risk in {"high", "critical"} else risk
-        if str(downgraded.get("action", "")) in {"notify_and_alarm", "notify_and_light", "notify_and_speaker"}:
+        downgraded["risk"] = "medium" if risk in _HIGH_RISKS else risk
+        if str(downgraded.get("action", "")) in _ESCALATED_ACTIONS:
             downgraded["action"] = "notify_and_save_clip"
         downgraded["reason"] = str(confirm_obj.get("reason") or "Unconfirmed on second pass — downgraded")
         log.info("Phase 5 confirmation rejected escalation for %s; downgraded decision", event_id)
@@ -906,7 +1503,7 @@ def maybe_confirm_decision(camera: str, event_id: str, decision: dict, policy: d
     upgraded = dict(decision)
     suggested_risk = str(confirm_obj.get("risk", upgraded.get("risk", "low"))).lower()
     suggested_action = str(confirm_obj.get("action", upgraded.get("action", "notify_only")))
-    if suggested_risk in {"low", "medium", "high", "critical"}:
+    if suggested_risk in _RISK_LEVELS:
         upgraded["risk"] = suggested_risk
     if suggested_action in ALLOWED_ACTIONS:
         upgraded["action"] = suggested_action
@@ -916,11 +1513,53 @@ def maybe_confirm_decision(camera: str, event_id: str, decision: dict, policy: d
     return upgraded, "Second-pass confirmation: confirmed."
 
 
+# Static WhatsApp alert fragments, built once at import.
+_WA_SEVERITY_EMOJI = {"LOW": "\U0001f7e2", "MEDIUM": "\U0001f7e1", "HIGH": "\U0001f7e0", "CRITICAL": "\U0001f534"}
+_WA_ACTION_TEXT = {
+    "notify_only": "\U0001f514 Alert sent",
+    "notify_and_save_clip": "\U0001f514 Alert sent\n\U0001f4be Clip saved",
+    "notify_and_light": "\U0001f514 Alert sent\n\U0001f4be Clip saved\n\U0001f4a1 Lights activated",
+    "notify_and_speaker": "\U0001f514 Alert sent\n\U0001f4be Clip saved\n\U0001f50a Alexa announcement",
+    "notify_and_alarm": "\U0001f6a8 ALARM ACTIVATED\n\U0001f4a1 All lights ON\n\U0001f50a Speakers active\n\U0001f4be Clip saved",
+}
+# home_mode (lowercase) -> (building status, expected activity)
+_WA_BUILDING_STATUS = {
+    "away": ("Unoccupied", "None"),
+    "sleep": ("Occupied (sleeping)", "None"),
+    "guest": ("Occupied (guests)", "Possible visitor movement"),
+}
+_WA_BUILDING_DEFAULT = ("Occupied", "Normal household activity")
+_WA_ESCALATION = {
+    "MEDIUM": (
+        "\n\n\u26a0\ufe0f *ESCALATION CONDITIONS*\n"
+        "Will upgrade to HIGH if:\n"
+        "\u2022 Subject remains > 60 sec\n"
+        "\u2022 Forced entry attempt detected\n"
+        "\u2022 Additional persons appear"
+    ),
+    "HIGH": (
+        "\n\n\u26a0\ufe0f *ESCALATION CONDITIONS*\n"
+        "Will upgrade to CRITICAL if:\n"
+        "\u2022 Break-in attempt detected\n"
+        "\u2022 Weapon or tool observed\n"
+        "\u2022 Multiple intruders confirmed"
+    ),
+    "CRITICAL": (
+        "\n\n\U0001f6a8 *IMMEDIATE RESPONSE*\n"
+        "\u2022 Alarm siren active\n"
+        "\u2022 All lights ON\n"
+        "\u2022 Evidence being recorded\n"
+        "\u2022 Consider calling authorities"
+    ),
+}
+
+
 def _format_whatsapp_alert(camera: str, event_id: str, analysis_text: str,
-                           decision: dict, policy: dict) -> str:
-    """Format professional structured WhatsApp security alert (Pillar 3)."""
-    from datetime import datetime as _dt
+                           decision: dict, policy: dict, clip_size: int | None = None) -> str:
+    """Format professional structured WhatsApp security alert (Pillar 3).
 
+    clip_size is the saved clip's size in bytes, or None when there is no clip.
+    """
     # Extract structured fields from decision
     risk_obj = decision.get("risk", {})
     if isinstance(risk_obj, dict):
@@ -932,8 +1571,7 @@ def _format_whatsapp_alert(camera: str, event_id: str, analysis_text: str,
         confidence = decision.get("confidence", 0.0)
         reason = str(decision.get("reason", ""))
 
-    severity_emoji = {"LOW": "\U0001f7e2", "MEDIUM": "\U0001f7e1", "HIGH": "\U0001f7e0", "CRITICAL": "\U0001f534"}
-    risk_icon = severity_emoji.get(risk_level, "\u2753")
+    risk_icon = _WA_SEVERITY_EMOJI.get(risk_level, "\u2753")
 
     # Subject info
     subject_obj = decision.get("subject", {})
@@ -979,76 +1617,34 @@ def _format_whatsapp_alert(camera: str, event_id: str, analysis_text: str,
     home_mode = str(policy.get("home_mode", "unknown")).title()
     time_of_day = str(policy.get("time_of_day", "unknown")).title()
     known_faces = "Yes" if policy.get("known_faces_present") else "No"
-    time_str = _dt.now().strftime("%H:%M:%S")
-    date_str = _dt.now().strftime("%d %b %Y")
+    now = datetime.now()
+    time_str = now.strftime("%H:%M:%S")
+    date_str = now.strftime("%d %b %Y")
 
     # Building status
-    if home_mode.lower() == "away":
-        building_status = "Unoccupied"
-        expected = "None"
-    elif home_mode.lower() == "sleep":
-        building_status = "Occupied (sleeping)"
-        expected = "None"
-    elif home_mode.lower() == "guest":
-        building_status = "Occupied (guests)"
-        expected = "Possible visitor movement"
-    else:
-        building_status = "Occupied"
-        expected = "Normal household activity"
+    building_status, expected = _WA_BUILDING_STATUS.get(home_mode.lower(), _WA_BUILDING_DEFAULT)
 
     # Action taken
     action_raw = str(decision.get("action", "notify_only"))
-    action_map = {
-        "notify_only": "\U0001f514 Alert sent",
-        "notify_and_save_clip": "\U0001f514 Alert sent\n\U0001f4be Clip saved",
-        "notify_and_light": "\U0001f514 Alert sent\n\U0001f4be Clip saved\n\U0001f4a1 Lights activated",
-        "notify_and_speaker": "\U0001f514 Alert sent\n\U0001f4be Clip saved\n\U0001f50a Alexa announcement",
-        "notify_and_alarm": "\U0001f6a8 ALARM ACTIVATED\n\U0001f4a1 All lights ON\n\U0001f50a Speakers active\n\U0001f4be Clip saved",
-    }
-    action_text = action_map.get(action_raw, action_raw.replace("_", " ").title())
+    action_text = _WA_ACTION_TEXT.get(action_raw) or action_raw.replace("_", " ").title()
 
     # Media info
     media_info = decide_media(risk_level.lower())
-    clip_path = SNAPSHOT_DIR.parent / "ai-clips" / f"{event_id}.mp4"
     snap_line = "\u2705 Snapshot attached"
-    clip_line = f"\u2705 {media_info['clip_length']}s clip attached" if clip_path.exists() else (
+    clip_line = f"\u2705 {media_info['clip_length']}s clip attached" if clip_size is not None else (
         f"\U0001f4be {media_info['clip_length']}s clip saving..." if media_info["clip"] else "\u274c No clip needed"
     )
     monitor_line = "\U0001f4f9 Continued monitoring active" if media_info["monitoring"] else ""
 
     # Escalation logic
-    escalation = ""
-    if risk_level == "MEDIUM":
-        escalation = (
-            "\n\n\u26a0\ufe0f *ESCALATION CONDITIONS*\n"
-            "Will upgrade to HIGH if:\n"
-            "\u2022 Subject remains > 60 sec\n"
-            "\u2022 Forced entry attempt detected\n"
-            "\u2022 Additional persons appear"
-        )
-    elif risk_level == "HIGH":
-        escalation = (
-            "\n\n\u26a0\ufe0f *ESCALATION CONDITIONS*\n"
-            "Will upgrade to CRITICAL if:\n"
-            "\u2022 Break-in attempt detected\n"
-            "\u2022 Weapon or tool observed\n"
-            "\u2022 Multiple intruders confirmed"
-        )
-    elif risk_level == "CRITICAL":
-        escalation = (
-            "\n\n\U0001f6a8 *IMMEDIATE RESPONSE*\n"
-            "\u2022 Alarm siren active\n"
-            "\u2022 All lights ON\n"
-            "\u2022 Evidence being recorded\n"
-            "\u2022 Consider calling authorities"
-        )
+    escalation = _WA_ESCALATION.get(risk_level, "")
 
     # Recent events
     recent_count = policy.get("recent_events_count", 0)
     recent_line = f"\nRecent: {recent_count} events in last 10 min" if recent_count > 0 else ""
 
     def _one_line(text: str, max_len: int = 180) -> str:
-        text = re.sub(r"\s+", " ", str(text or "")).strip()
+        text = _WHITESPACE_RUN_RE.sub(" ", str(text or "")).strip()
         if len(text) > max_len:
             return text[: max_len - 3] + "..."
         return text
@@ -1139,59 +1735,199 @@ def deliver_whatsapp_message(camera: str, event_id: str, analysis_text: str,
         decision = _fallback_decision(analysis_text)
     if policy is None:
         policy = {}
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {OPENCLAW_TOKEN}",
-    }
 
     # Build single message: snapshot MEDIA at top, formatted text, clip MEDIA at bottom
     snapshot_media = f"MEDIA:./ai-snapshots/{event_id}.jpg"
-    formatted_text = _format_whatsapp_alert(camera, event_id, analysis_text, decision, policy)
 
-    # Check for clip (attach at bottom if exists)
+    # Check for clip (attach at bottom if exists); one stat serves the formatter too
     clip_path = SNAPSHOT_DIR.parent / "ai-clips" / f"{event_id}.mp4"
     clip_line = ""
-    if clip_path.exists() and clip_path.stat().st_size > 1000:
+    try:
+        clip_size = clip_path.stat().st_size
+    except FileNotFoundError:
+        clip_size = None
+    formatted_text = _format_whatsapp_alert(camera, event_id, analysis_text, decision, policy, clip_size)
+    if clip_size is not None and clip_size > 1000:
         clip_line = f"\nMEDIA:./ai-clips/{event_id}.mp4"
-        log.info("Clip found for %s (%d bytes) — attaching to alert",
-                 event_id, clip_path.stat().st_size)
+        log.info("Clip found for %s (%d bytes) — attaching to alert", event_id, clip_size)
 
     message = f"{snapshot_media}\n{formatted_text}{clip_line}"
 
-    for number in WHATSAPP_TO:
+    clip_tag = " [+clip]" if clip_line else ""
+    # The alert body is shared by every recipient; encode it once and splice
+    # it after each recipient's instruction (JSON strings concatenate).
+    message_json = _json_dumps_bytes(message)
+
+    def _post_one(number: str) -> None:
         # Build instruction that explicitly tells the agent WHERE to send
-        delivery_msg = (
+        instruction = (
             f"Send the following security alert to WhatsApp number {number}. "
             f"Target: {number}. Do not extract targets from message body. "
             "Send exactly one WhatsApp message. Do not send any confirmation, "
             "summary, or follow-up message. "
             f"Forward EXACTLY as-is to {number}:\n\n"
-        ) + message
-        payload = {
-            "message": delivery_msg,
-            "deliver": False,
-            "channel": "whatsapp",
-            "to": number,
-            "name": "Frigate",
-            "sessionKey": f"frigate:alert:{OPENCLAW_DELIVERY_AGENT_NAME}:{camera}:{event_id}:{number}",
-            "timeoutSeconds": 60,
-        }
+        )
+        body = _openclaw_body(
+            _json_dumps_bytes(instruction)[:-1] + message_json[1:],
+            deliver=False,
+            channel="whatsapp",
+            to=number,
+            name="Frigate",
+            sessionKey=f"frigate:alert:{OPENCLAW_DELIVERY_AGENT_NAME}:{camera}:{event_id}:{number}",
+            timeoutSeconds=60,
+        )
         try:
-            resp = requests.post(
-                OPENCLAW_DELIVERY_WEBHOOK, json=payload, headers=headers, timeout=60,
-            )
+            resp = SESSION_OPENCLAW.post(OPENCLAW_DELIVERY_WEBHOOK, data=body, timeout=60)
             if resp.status_code in (200, 201, 202):
-                log.info("WhatsApp alert accepted for %s (%d)%s",
-                         number, resp.status_code, " [+clip]" if clip_line else "")
+                log.info("WhatsApp alert accepted for %s (%d)%s", number, resp.status_code, clip_tag)
             else:
                 log.error("WhatsApp alert to %s returned %d: %s",
                           number, resp.status_code, resp.text[:200])
         except requests.RequestException as exc:
             log.error("WhatsApp alert to %s failed: %s", number, exc)
 
+    # Recipients are independent; post them concurrently and wait for all.
+    if _delivery_executor is None or len(WHATSAPP_TO) < 2:
+        for number in WHATSAPP_TO:
+            _post_one(number)
+        return
+    for _ in _delivery_executor.map(_post_one, WHATSAPP_TO):
+        pass
+
 
-def read_openclaw_session_reply(session_key: str, timeout_seconds: int = 60) -> str | None:
-    """Read the latest assistant reply from OpenClaw session logs for a session key."""
+# inotify via libc (Linux); session waits fall back to 1 s polling without it.
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+_libc = None
+
+
+def _watch_dir(directory: Path) -> int | None:
+    """Return an inotify fd watching directory for writes/creates, or None."""
+    global _libc
+    try:
+        if _libc is None:
+            _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = _libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if _libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (AttributeError, OSError):
+        return None
+
+
+def _wait_for_change(watch_fd: int | None, timeout: float) -> None:
+    """Block until the watched directory changes or timeout elapses."""
+    if timeout <= 0:
+        return
+    if watch_fd is None:
+        _shutdown.wait(timeout)
+        return
+    ready, _, _ = select.select([watch_fd], [], [], timeout)
+    if ready:
+        try:
+            while os.read(watch_fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+
+def _session_assistant_text(item) -> str | None:
+    """Return the text of an assistant message record from a session JSONL, else None."""
+    if not isinstance(item, dict) or item.get("type") != "message":
+        return None
+    message = item.get("message")
+    if not isinstance(message, dict) or message.get("role") != "assistant":
+        return None
+    content = message.get("content") or []
+    if not isinstance(content, list):
+        return None
+    text_parts = []
+    for part in content:
+        if isinstance(part, dict) and part.get("type") == "text":
+            text = part.get("text")
+            if text:
+                text_parts.append(text)
+    if not text_parts:
+        return None
+    return "\n".join(text_parts).strip()
+
+
+_MEDIA_LINE_RE = re.compile(r"^[^\S\n]*MEDIA:[^\n]*(?:\n|\Z)", re.M)
+
+
+def _session_tail_reply(fh, block: int = 8192) -> tuple[int, str | None]:
+    """Scan an open session JSONL backwards for its newest assistant reply.
+
+    Returns (offset, reply); offset is where forward tailing should resume:
+    end of file, or the start of a trailing line that is still being written.
+    """
+    end = fh.seek(0, os.SEEK_END)
+    pos = end
+    carry = b""
+    resume = None
+    while pos > 0:
+        step = min(block, pos)
+        pos -= step
+        fh.seek(pos)
+        pieces = (fh.read(step) + carry).split(b"\n")
+        carry = pieces.pop(0) if pos > 0 else b""  # may start mid-line
+        for line in reversed(pieces):
+            if resume is None:
+                # The file's last line has no newline yet if it is mid-write.
+                resume = end
+                if not line.strip():
+                    continue
+                try:
+                    record = _json_loads(line)
+                except ValueError:
+                    resume = end - len(line)
+                    continue
+                try:
+                    reply = _session_assistant_text(record)
+                except (ValueError, TypeError, AttributeError):
+                    continue
+                if reply:
+                    return resume, reply
+                continue
+            if b'"assistant"' not in line:
+                continue
+            try:
+                reply = _session_assistant_text(_json_loads(line))
+            except (ValueError, TypeError, AttributeError):
+                continue
+            if reply:
+                return resume, reply
+    return (end if resume is None else resume), None
+
+
+def _load_sessions_index() -> dict:
+    """Return the parsed OpenClaw sessions index, re-reading only when it changed."""
+    st = OPENCLAW_SESSIONS_INDEX.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _sessions_index_lock:
+        if _sessions_index_cache["stamp"] == stamp:
+            return _sessions_index_cache["data"]
+    data = _json_loads(OPENCLAW_SESSIONS_INDEX.read_bytes())
+    with _sessions_index_lock:
+        _sessions_index_cache["stamp"] = stamp
+        _sessions_index_cache["data"] = data
+    return data
+
+
+def read_openclaw_session_reply(session_key: str, timeout_seconds: int = 60,
+                               cancel: threading.Event | None = None) -> str | None:
+    """Read the latest assistant reply from OpenClaw session logs for a session key.
+
+    Setting cancel stops the wait early (within the 1 s poll cap).
+    """
     if not OPENCLAW_SESSIONS_INDEX.exists():
         log.warning("OpenClaw sessions index not found: %s", OPENCLAW_SESSIONS_INDEX)
         return None
@@ -1201,12 +1937,28 @@ def read_openclaw_session_reply(session_key: str, timeout_seconds: int = 60) ->
     full_key = f"agent:{OPENCLAW_ANALYSIS_AGENT_NAME}:{norm_key}"
 
     deadline = time.time() + timeout_seconds
+    # Wake as soon as OpenClaw writes the index/session file; the 1 s cap keeps
+    # the old polling behaviour as a safety net for missed or unsupported events.
+    watch_fd = _watch_dir(OPENCLAW_SESSIONS_DIR)
+    try:
+        return _await_session_reply(session_key, full_key, deadline, watch_fd, cancel)
+    finally:
+        if watch_fd is not None:
+            os.close(watch_fd)
+
+
+def _await_session_reply(session_key: str, full_key: str, deadline: float,
+                         watch_fd: int | None, cancel: threading.Event | None) -> str | None:
+    """Wait for the session to be indexed, then for its first assistant reply."""
+    def _stopped() -> bool:
+        return _shutdown.is_set() or (cancel is not None and cancel.is_set())
+
     session_id = None
 
     # Wait for session to be created
-    while time.time() < deadline and not session_id:
+    while time.time() < deadline and not session_id and not _stopped():
         try:
-            data = json.loads(OPENCLAW_SESSIONS_INDEX.read_text())
+            data = _load_sessions_index()
             entry = data.get(full_key)
             if entry and isinstance(entry, dict):
                 session_id = entry.get("sessionId")
@@ -1214,7 +1966,7 @@ def read_openclaw_session_reply(session_key: str, timeout_seconds: int = 60) ->
                     break
         except Exception as exc:
             log.warning("Failed reading sessions index: %s", exc)
-        time.sleep(1)
+        _wait_for_change(watch_fd, min(1.0, deadline - time.time()))
 
     if not session_id:
         log.warning("No OpenClaw session found for key %s", full_key)
@@ -1222,48 +1974,78 @@ def read_openclaw_session_reply(session_key: str, timeout_seconds: int = 60) ->
 
     session_file = OPENCLAW_SESSIONS_DIR / f"{session_id}.jsonl"
 
-    # Wait for session file and assistant reply to appear
-    while time.time() < deadline:
-        if not session_file.exists():
-            time.sleep(1)
-            continue
-        try:
-            last_reply = None
-            with session_file.open("r", encoding="utf-8") as fh:
-                for line in fh:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        item = json.loads(line)
-                    except json.JSONDecodeError:
-                        continue
-                    if item.get("type") != "message":
-                        continue
-                    message = item.get("message") or {}
-                    if message.get("role") != "assistant":
-                        continue
-                    content = message.get("content") or []
-                    if not isinstance(content, list):
-                        continue
-                    text_parts = []
-                    for part in content:
-                        if isinstance(part, dict) and part.get("type") == "text":
-                            text = part.get("text")
-                            if text:
-                                text_parts.append(text)
-                    if text_parts:
-                        last_reply = "\n".join(text_parts).strip()
+    # Wait for session file and assistant reply to appear. The first pass
+    # walks the file backwards from the end; after that the JSONL is tailed
+    # forward, reading just the bytes appended since the last pass from a
+    # handle that stays open for the whole wait.
+    offset = 0
+    last_reply = None
+    fh = None
+    try:
+        while time.time() < deadline and not _stopped():
+            if fh is None:
+                try:
+                    fh = session_file.open("rb")
+                    offset, last_reply = _session_tail_reply(fh)
+                except FileNotFoundError:
+                    _wait_for_change(watch_fd, min(1.0, deadline - time.time()))
+                    continue
+                except Exception as exc:
+                    log.warning("Failed opening session file %s: %s", session_file, exc)
+                    if fh is not None:
+                        fh.close()
+                        fh = None
+                    _wait_for_change(watch_fd, min(1.0, deadline - time.time()))
+                    continue
+                chunk = b""
+            else:
+                try:
+                    fh.seek(offset)
+                    chunk = fh.read()
+                except OSError as exc:
+                    log.warning("Failed reading session file %s: %s", session_file, exc)
+                    _wait_for_change(watch_fd, min(1.0, deadline - time.time()))
+                    continue
+
+            # A trailing line without a newline may still be mid-write; keep it
+            # for the next pass unless it already parses as a whole record.
+            complete = chunk.rfind(b"\n") + 1
+            lines = chunk[:complete].splitlines()
+            tail = chunk[complete:].strip()
+            if tail:
+                try:
+                    _json_loads(tail)
+                    lines.append(tail)
+                    complete = len(chunk)
+                except ValueError:
+                    pass
+            offset += complete
+
+            # Newest record wins, so scan backwards and stop at the first assistant
+            # reply; the byte test skips parsing user/tool records entirely.
+            for line in reversed(lines):
+                if b'"assistant"' not in line:
+                    continue
+                try:
+                    reply = _session_assistant_text(_json_loads(line))
+                except (ValueError, TypeError, AttributeError):
+                    continue
+                if reply:
+                    last_reply = reply
+                    break
 
             if last_reply:
                 # Strip MEDIA line for HA; keep analysis text
-                lines = [ln for ln in last_reply.splitlines() if not ln.strip().startswith("MEDIA:")]
-                cleaned = "\n".join(lines).strip()
+                cleaned = last_reply
+                if "MEDIA:" in cleaned:
+                    cleaned = _MEDIA_LINE_RE.sub("", cleaned)
+                cleaned = "\n".join(cleaned.splitlines()).strip()
                 return cleaned or last_reply
-        except Exception as exc:
-            log.warning("Failed reading session file %s: %s", session_file, exc)
 
-        time.sleep(1)
+            _wait_for_change(watch_fd, min(1.0, deadline - time.time()))
+    finally:
+        if fh is not None:
+            fh.close()
 
     if not session_file.exists():
         log.warning("OpenClaw session file missing after timeout: %s", session_file)
@@ -1272,18 +2054,56 @@ def read_openclaw_session_reply(session_key: str, timeout_seconds: int = 60) ->
     return None
 
 
+_THREAT_LEVEL_RE = re.compile(r"THREAT: ?(HIGH|MEDIUM)", re.IGNORECASE)
+# Fallback type keywords in priority order; the first bucket with any hit wins.
+_TYPE_KEYWORDS = (
+    ("delivery", ("DELIVERY", "PACKAGE", "COURIER", "PARCEL")),
+    ("known_person", ("KNOWN PERSON", "FAMILIAR", "RECOGNIZED", "HOUSEHOLD")),
+    ("loitering", ("LOITERING", "LINGERING", "WAITING SUSPICIOUSLY")),
+    ("vehicle", ("VEHICLE", "CAR ", "MOTORCYCLE", "BIKE ")),
+    ("animal", ("ANIMAL", "CAT ", "DOG ", "BIRD ")),
+    ("unknown_person", ("PERSON", "INDIVIDUAL", "MALE", "FEMALE")),
+)
+_TYPE_KEYWORD_BUCKET = {kw: bucket for bucket, kws in _TYPE_KEYWORDS for kw in kws}
+_TYPE_PRIORITY = {bucket: i for i, (bucket, _) in enumerate(_TYPE_KEYWORDS)}
+_TYPE_KEYWORD_RE = re.compile(
+    "|".join(re.escape(kw) for kw in sorted(_TYPE_KEYWORD_BUCKET, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+
+
 def extract_risk(analysis: str) -> str:
     """Extract threat/risk level from the analysis text."""
-    upper = analysis.upper()
-    if "THREAT: HIGH" in upper or "THREAT:HIGH" in upper:
-        return "high"
-    if "THREAT: MEDIUM" in upper or "THREAT:MEDIUM" in upper:
-        return "medium"
-    return "low"
+    # HIGH anywhere outranks MEDIUM, so stop at the first HIGH match.
+    risk = "low"
+    for match in _THREAT_LEVEL_RE.finditer(analysis):
+        if match.group(1)[0] in "Hh":
+            return "high"
+        risk = "medium"
+    return risk
+
+
+def _detect_type(analysis: str) -> str:
+    """Pick the highest-priority detection type mentioned in freeform text."""
+    best = len(_TYPE_KEYWORDS)
+    for kw in _TYPE_KEYWORD_RE.findall(analysis):
+        best = min(best, _TYPE_PRIORITY[_TYPE_KEYWORD_BUCKET[kw.upper()]])
+        if best == 0:
+            break
+    return _TYPE_KEYWORDS[best][0] if best < len(_TYPE_KEYWORDS) else "other"
 
 
 DECISION_REQUIRED_KEYS = {"risk", "type", "confidence", "action", "reason"}
 
+# Reply-parsing patterns run on every event; keep them compiled at module scope
+# rather than passing pattern strings to re.match/re.search in the hot path.
+_JSON_LINE_RE = re.compile(r"(?i)^json:\s*(.*)")
+_JSON_MARKER_ANY_RE = re.compile(r"(?i)json:")
+_CONFIRM_JSON_LINE_RE = re.compile(r"(?i)^confirm_json:\s*(.*)")
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*\n(\{[^`]+\})\s*\n```", re.IGNORECASE)
+_EMBEDDED_DECISION_RE = re.compile(r'(\{[^{}]*"risk"\s*:\s*"[^"]*"[^{}]*\})')
+_WHITESPACE_RUN_RE = re.compile(r"\s+")
+
 
 def parse_decision_json(analysis: str) -> dict:
     """Extract the JSON decision block from the analysis text.
@@ -1302,7 +2122,10 @@ def parse_decision_json(analysis: str) -> dict:
     # Strategy 1: Look for explicit JSON: prefix (original approach)
     for i in range(len(lines) - 1, -1, -1):
         stripped = lines[i].strip()
-        match = re.match(r"(?i)^json:\s*(.*)", stripped)
+        # Cheap prefix test first; the regex only runs on candidate lines.
+        if stripped[:5].lower() != "json:":
+            continue
+        match = _JSON_LINE_RE.match(stripped)
         if match:
             json_str = match.group(1).strip()
             if not json_str and i + 1 < len(lines):
@@ -1315,7 +2138,7 @@ def parse_decision_json(analysis: str) -> dict:
             break
 
     # Strategy 2: Look for ```json ... ``` code fence
-    fence_match = re.search(r"```(?:json)?\s*\n(\{[^`]+\})\s*\n```", analysis, re.IGNORECASE)
+    fence_match = _JSON_FENCE_RE.search(analysis) if "```" in analysis else None
     if fence_match:
         obj = _try_parse_decision(fence_match.group(1).strip())
         if obj:
@@ -1332,7 +2155,7 @@ def parse_decision_json(analysis: str) -> dict:
                 return obj
 
     # Strategy 4: Find JSON embedded within text (e.g. "... result: {"risk":...}")
-    json_match = re.search(r'(\{[^{}]*"risk"\s*:\s*"[^"]*"[^{}]*\})', analysis)
+    json_match = _EMBEDDED_DECISION_RE.search(analysis) if '"risk"' in analysis else None
     if json_match:
         obj = _try_parse_decision(json_match.group(1))
         if obj:
@@ -1347,7 +2170,7 @@ def _try_parse_decision(json_str: str) -> dict | None:
     """Attempt to parse a JSON string as a decision object.
     Handles both flat and structured (nested) formats."""
     try:
-        obj = json.loads(json_str)
+        obj = _json_loads(json_str)
         if not isinstance(obj, dict):
             return None
 
@@ -1373,7 +2196,7 @@ def _try_parse_decision(json_str: str) -> dict | None:
             return obj
         if DECISION_REQUIRED_KEYS.issubset(obj.keys()):
             return obj
-    except (json.JSONDecodeError, ValueError):
+    except ValueError:
         pass
     return None
 
@@ -1381,32 +2204,17 @@ def _try_parse_decision(json_str: str) -> dict | None:
 def _fallback_decision(analysis: str) -> dict:
     """Build a decision dict from text-based extraction when JSON parsing fails."""
     risk = extract_risk(analysis)
-    upper = analysis.upper() if analysis else ""
     # Try to extract type from analysis text
-    det_type = "other"
-    if any(w in upper for w in ("DELIVERY", "PACKAGE", "COURIER", "PARCEL")):
-        det_type = "delivery"
-    elif any(w in upper for w in ("KNOWN PERSON", "FAMILIAR", "RECOGNIZED", "HOUSEHOLD")):
-        det_type = "known_person"
-    elif any(w in upper for w in ("LOITERING", "LINGERING", "WAITING SUSPICIOUSLY")):
-        det_type = "loitering"
-    elif any(w in upper for w in ("VEHICLE", "CAR ", "MOTORCYCLE", "BIKE ")):
-        det_type = "vehicle"
-    elif any(w in upper for w in ("ANIMAL", "CAT ", "DOG ", "BIRD ")):
-        det_type = "animal"
-    elif "PERSON" in upper or "INDIVIDUAL" in upper or "MALE" in upper or "FEMALE" in upper:
-        det_type = "unknown_person"
+    det_type = _detect_type(analysis) if analysis else "other"
 
     subject_desc, behavior = _extract_plaintext_subject_behavior(analysis)
     identity = "known" if det_type == "known_person" else "unknown"
 
-    # Map risk to action
-    action_map = {"low": "notify_only", "medium": "notify_and_save_clip", "high": "notify_and_light", "critical": "notify_and_alarm"}
     return {
         "risk": risk,
         "type": det_type,
         "confidence": 0.4 if risk == "low" else 0.6,
-        "action": action_map.get(risk, "notify_only"),
+        "action": _RISK_DEFAULT_ACTION.get(risk, "notify_only"),
         "reason": "Inferred from AI text" if analysis else "AI decision unavailable",
         "subject": {"identity": identity, "description": subject_desc},
         "behavior": behavior,
@@ -1467,7 +2275,7 @@ def sanitize_decision(decision: dict) -> dict:
     out = dict(decision or {})
 
     risk = str(out.get("risk", "low")).lower()
-    if risk not in {"low", "medium", "high", "critical"}:
+    if risk not in _RISK_LEVELS:
         risk = "low"
     out["risk"] = risk
 
@@ -1488,6 +2296,7 @@ def sanitize_decision(decision: dict) -> dict:
 
     out["type"] = str(out.get("type", "other"))
     out["reason"] = str(out.get("reason", "AI decision unavailable"))
+    out["behavior"] = str(out.get("behavior", ""))
     return out
 
 
@@ -1499,6 +2308,9 @@ def strip_json_block(analysis: str) -> str:
     - JSON:
       {...}
     """
+    # Nothing to strip unless a json: marker appears somewhere.
+    if not _JSON_MARKER_ANY_RE.search(analysis):
+        return "\n".join(analysis.splitlines()).strip()
     out = []
     skip_next_json_line = False
     for line in analysis.splitlines():
@@ -1510,7 +2322,7 @@ def strip_json_block(analysis: str) -> str:
                 continue
             skip_next_json_line = False
 
-        match = re.match(r"(?i)^json:\s*(.*)", stripped)
+        match = _JSON_LINE_RE.match(stripped) if stripped[:5].lower() == "json:" else None
         if match:
             tail = match.group(1).strip()
             if tail.startswith("{") and tail.endswith("}"):
@@ -1526,23 +2338,26 @@ def strip_json_block(analysis: str) -> str:
 # ---------------------------------------------------------------------------
 # Phase 2 — HA REST action execution
 # ---------------------------------------------------------------------------
-def _is_quiet_hours() -> bool:
-    hour = datetime.now().hour
+def _in_quiet_window(hour: int) -> bool:
     if QUIET_HOURS_START > QUIET_HOURS_END:
         return hour >= QUIET_HOURS_START or hour < QUIET_HOURS_END
     return QUIET_HOURS_START <= hour < QUIET_HOURS_END
 
 
+# Quiet hours are fixed once runtime config is loaded, so precompute per hour.
+_QUIET_HOUR_MASK = tuple(_in_quiet_window(h) for h in range(24))
+
+
+def _is_quiet_hours() -> bool:
+    return _QUIET_HOUR_MASK[time.localtime().tm_hour]
+
+
 def _ha_call_service(domain: str, service: str, data: dict) -> bool:
     """Call a Home Assistant service via REST API. Retries once on failure."""
     url = f"{HA_URL}/api/services/{domain}/{service}"
-    headers = {
-        "Authorization": f"Bearer {HA_TOKEN}",
-        "Content-Type": "application/json",
-    }
     for attempt in range(2):
         try:
-            resp = requests.post(url, json=data, headers=headers, timeout=10)
+            resp = SESSION_HA.post(url, json=data, timeout=10)
             if resp.status_code in (200, 201):
                 log.info("HA service %s/%s OK (attempt %d)", domain, service, attempt + 1)
                 return True
@@ -1556,6 +2371,13 @@ def _ha_call_service(domain: str, service: str, data: dict) -> bool:
     return False
 
 
+def _ha_call_service_batched(domain: str, service: str, entity_ids: list[str] | tuple[str, ...], data: dict) -> bool:
+    """Call one HA service for several entities in a single request."""
+    if not entity_ids:
+        return True
+    return _ha_call_service(domain, service, {"entity_id": list(entity_ids), **data})
+
+
 def _action_save_clip(camera: str, event_id: str = "") -> bool:
     """Retain the Frigate event clip via Frigate REST API and export it."""
     if not event_id:
@@ -1564,7 +2386,7 @@ def _action_save_clip(camera: str, event_id: str = "") -> bool:
     # Mark event for indefinite retention
     try:
         retain_url = f"{FRIGATE_API}/api/events/{event_id}/retain"
-        resp = requests.post(retain_url, timeout=10)
+        resp = SESSION_FRIGATE.post(retain_url, timeout=10)
         if resp.status_code in (200, 201):
             log.info("Frigate event %s marked for retention", event_id)
         else:
@@ -1576,16 +2398,34 @@ def _action_save_clip(camera: str, event_id: str = "") -> bool:
     clip_dir = SNAPSHOT_DIR.parent / "ai-clips"
     clip_dir.mkdir(parents=True, exist_ok=True)
     clip_path = clip_dir / f"{event_id}.mp4"
+    part_path = clip_path.with_name(clip_path.name + ".part")
+    clip_url = f"{FRIGATE_API}/api/events/{event_id}/clip.mp4"
     try:
-        clip_url = f"{FRIGATE_API}/api/events/{event_id}/clip.mp4"
-        resp = requests.get(clip_url, timeout=30)
-        if resp.status_code == 200 and len(resp.content) > 1000:
-            clip_path.write_bytes(resp.content)
-            stage_clip_for_openclaw(clip_path, event_id)
-            log.info("Saved clip %s (%d bytes)", clip_path, len(resp.content))
-            return True
-        log.warning("Clip download for %s returned %d (%d bytes)", event_id, resp.status_code, len(resp.content))
-    except requests.RequestException as exc:
+        # Stream to a .part file so the clip is never held in memory and
+        # readers never see a half-written .mp4.
+        with SESSION_FRIGATE.get(clip_url, timeout=30, stream=True) as resp:
+            try:
+                declared = int(resp.headers.get("Content-Length") or 0)
+            except ValueError:
+                declared = 0  # malformed/comma-joined header; judge by bytes received
+            if resp.status_code != 200 or 0 < declared <= 1000:
+                log.warning("Clip download for %s returned %d (%d bytes)", event_id, resp.status_code, declared)
+                return False
+            total = 0
+            with part_path.open("wb") as fh:
+                for chunk in resp.iter_content(chunk_size=65536):
+                    fh.write(chunk)
+                    total += len(chunk)
+        if total <= 1000:
+            part_path.unlink(missing_ok=True)
+            log.warning("Clip download for %s returned %d (%d bytes)", event_id, resp.status_code, total)
+            return False
+        os.replace(part_path, clip_path)
+        stage_clip_for_openclaw(clip_path, event_id)
+        log.info("Saved clip %s (%d bytes)", clip_path, total)
+        return True
+    except (requests.RequestException, OSError) as exc:
+        part_path.unlink(missing_ok=True)
         log.warning("Clip download for %s failed: %s", event_id, exc)
     return False
 
@@ -1593,14 +2433,7 @@ def _action_save_clip(camera: str, event_id: str = "") -> bool:
 def _action_light(camera: str) -> bool:
     """Turn on zone lights for the camera."""
     entities = CAMERA_ZONE_LIGHTS.get(camera, CAMERA_ZONE_LIGHTS_DEFAULT)
-    ok = True
-    for entity in entities:
-        if not _ha_call_service("light", "turn_on", {
-            "entity_id": entity,
-            "brightness_pct": 100,
-        }):
-            ok = False
-    return ok
+    return _ha_call_service_batched("light", "turn_on", entities, {"brightness_pct": 100})
 
 
 def _action_speaker(camera: str, tts_msg: str) -> bool:
@@ -1624,6 +2457,22 @@ def _action_alarm() -> bool:
     })
 
 
+def _run_actions(*calls) -> list[bool]:
+    """Run independent sub-actions concurrently; a raised error counts as False."""
+    if _action_executor is None or len(calls) < 2:
+        futures = None
+    else:
+        futures = [_action_executor.submit(fn, *args) for fn, *args in calls]
+    results = []
+    for i, (fn, *args) in enumerate(calls):
+        try:
+            results.append(bool(futures[i].result() if futures else fn(*args)))
+        except Exception:
+            log.exception("Action %s failed", fn.__name__)
+            results.append(False)
+    return results
+
+
 def execute_action(decision: dict, camera: str, tts_msg: str, event_id: str = "") -> None:
     """Execute the HA action from the decision JSON.
 
@@ -1656,8 +2505,9 @@ def execute_action(decision: dict, camera: str, tts_msg: str, event_id: str = ""
         return
 
     if action == "notify_and_light":
-        _action_save_clip(camera, event_id=event_id)  # always save clip for high risk
-        if not _action_light(camera):
+        # Clip export (Frigate) and lights (HA) are unrelated; always save clip for high risk
+        _, light_ok = _run_actions((_action_save_clip, camera, event_id), (_action_light, camera))
+        if not light_ok:
             log.error("Failed to turn on lights for %s — fallback to notify_only", camera)
         return
 
@@ -1670,15 +2520,44 @@ def execute_action(decision: dict, camera: str, tts_msg: str, event_id: str = ""
         return
 
     if action == "notify_and_alarm":
-        # Alarm is the highest escalation — also turn on lights
-        _action_light(camera)
-        if not _action_alarm():
-            log.error("Failed to activate alarm — fallback to notify_only")
+        # Alarm is the highest escalation — also turn on lights; fire all at once
+        calls = [(_action_alarm,), (_action_light, camera)]
         if not _is_quiet_hours() or risk == "critical":
-            _action_speaker(camera, tts_msg)
+            calls.append((_action_speaker, camera, tts_msg))
+        if not _run_actions(*calls)[0]:
+            log.error("Failed to activate alarm — fallback to notify_only")
         return
 
 
+_TTS_SEVERITY_WORDS = {
+    "low": "low priority",
+    "medium": "medium priority. Please review.",
+    "high": "high priority. Attention required.",
+    "critical": "critical. Immediate attention required.",
+}
+
+
+def _build_tts_template(risk: str, action: str) -> tuple[str, str]:
+    """Return (severity phrase, closing sentences) for a risk/action pair."""
+    closing = ""
+    if risk in ("medium", "high", "critical"):
+        if "clip" in action:
+            closing += " Clip has been saved."
+        if "light" in action:
+            closing += " Lights have been turned on."
+        if "alarm" in action:
+            closing += " Alarm has been activated."
+    return _TTS_SEVERITY_WORDS.get(risk, ""), closing
+
+
+# Every sanitized decision lands on one of these; anything else is built on demand.
+_TTS_TEMPLATES = {
+    (risk, action): _build_tts_template(risk, action)
+    for risk in _RISK_LEVELS
+    for action in ALLOWED_ACTIONS
+}
+
+
 def make_tts(camera: str, analysis: str, decision: dict | None = None, policy: dict | None = None) -> str:
     """Create a descriptive Alexa spoken security briefing."""
     if decision is None:
@@ -1687,72 +2566,98 @@ def make_tts(camera: str, analysis: str, decision: dict | None = None, policy: d
         policy = {}
 
     risk = str(decision.get("risk", "low")).lower()
-    det_type = str(decision.get("type", "person")).replace("_", " ")
+    action = str(decision.get("action", "notify_only"))
     reason = str(decision.get("reason", ""))
-    action = str(decision.get("action", "notify_only")).replace("_", " ")
-    camera_zone = str(policy.get("camera_zone", "")).replace("-", " ")
     behavior = str(decision.get("behavior", ""))
-
-    # Severity word for speech
-    severity_word = {
-        "low": "low priority",
-        "medium": "medium priority. Please review.",
-        "high": "high priority. Attention required.",
-        "critical": "critical. Immediate attention required.",
-    }.get(risk, "")
+    template = _TTS_TEMPLATES.get((risk, action))
+    if template is None:
+        template = _build_tts_template(risk, action.replace("_", " "))
+    severity_word, closing = template
 
     # Subject description from AI
     subject_obj = decision.get("subject", {})
     if isinstance(subject_obj, dict) and subject_obj.get("description"):
         subject_desc = str(subject_obj["description"])
     else:
-        subject_desc = det_type
-
-    # Build speech
-    parts = [f"Security alert from {camera}."]
-    parts.append(f"Severity: {severity_word}")
-    parts.append(f"{subject_desc} detected in {camera_zone} area.")
+        subject_desc = str(decision.get("type", "person")).replace("_", " ")
 
+    camera_zone = str(policy.get("camera_zone", "")).replace("-", " ")
+    speech = f"Security alert from {camera}. Severity: {severity_word} {subject_desc} detected in {camera_zone} area."
     if behavior:
         # Keep behavior short for speech
-        beh_short = behavior.split(".")[0].strip()
+        beh_short = behavior.split(".", 1)[0].strip()
         if beh_short and len(beh_short) < 120:
-            parts.append(beh_short + ".")
-
+            speech += f" {beh_short}."
     if reason and len(reason) < 100:
-        parts.append(f"Risk assessment: {reason}.")
+        speech += f" Risk assessment: {reason}."
+    return speech + closing
 
-    if risk in ("medium", "high", "critical"):
-        if "clip" in action:
-            parts.append("Clip has been saved.")
-        if "light" in action:
-            parts.append("Lights have been turned on.")
-        if "alarm" in action:
-            parts.append("Alarm has been activated.")
 
-    return " ".join(parts)
+_HA_SEVERITY_EMOJI = {"low": "\U0001f7e2", "medium": "\U0001f7e1", "high": "\U0001f7e0", "critical": "\U0001f534"}
+# MEDIA:/Attached lines and snapshot paths are blanked, then each run of
+# whitespace spanning a newline collapses to one "\n" (trims lines, drops blanks).
+_HA_JUNK_LINE_RE = re.compile(r"(?im)^[^\S\n]*(?:media:|attached).*$|^.*ai-snapshots/.*$")
+_HA_LINE_BREAK_RE = re.compile(r"\s*\n\s*")
 
 
-def publish_analysis(client: mqtt.Client, camera: str, label: str,
-                     analysis: str, event_id: str, snapshot_path: Path,
-                     decision: dict | None = None, policy: dict | None = None):
-    """Publish structured AI analysis to MQTT for Home Assistant."""
-    if decision is None:
-        decision = _fallback_decision(analysis)
-    if policy is None:
-        policy = {}
+# Per-risk media keys of the HA payload, spliced in with ** instead of being
+# rebuilt from decide_media() on every publish.
+_HA_MEDIA_FIELDS = {
+    risk: {
+        "media_snapshot": media["snapshot"],
+        "media_clip": media["clip"],
+        "media_clip_length": media["clip_length"],
+        "media_monitoring": media["monitoring"],
+    }
+    for risk, media in [*_MEDIA_BY_RISK.items(), (None, _MEDIA_DEFAULT)]
+}
+_FRIGATE_EVENTS_URL = f"{FRIGATE_API}/api/events/"
 
-    risk = str(decision.get("risk", "low")).lower()
+
+@functools.lru_cache(maxsize=128)
+def _title_label(value: str, separator: str = "") -> str:
+    """Display form of a policy/decision value; the inputs come from a small vocabulary."""
+    if separator:
+        value = value.replace(separator, " ")
+    return value.title()
+
+
+# event_id -> Timer holding a not-yet-sent "pending" placeholder publish
+_pending_publishes: dict[str, threading.Timer] = {}
+_pending_publishes_lock = threading.Lock()
+
+
+def _flush_pending_publish(client: mqtt.Client, event_id: str, body: bytes) -> None:
+    """Timer callback: send the placeholder unless the final analysis replaced it."""
+    with _pending_publishes_lock:
+        if _pending_publishes.get(event_id) is not threading.current_thread():
+            return
+        del _pending_publishes[event_id]
+        result = client.publish(MQTT_TOPIC_PUBLISH, body, qos=1, retain=True)
+    log.info("Published pending analysis to %s (rc=%s)", MQTT_TOPIC_PUBLISH, result.rc)
+
+
+def _cancel_pending_publishes() -> None:
+    with _pending_publishes_lock:
+        for timer in _pending_publishes.values():
+            timer.cancel()
+        _pending_publishes.clear()
+
+
+def _build_ha_payload(camera: str, label: str, analysis: str, event_id: str,
+                      snapshot_path: Path, decision: dict, policy: dict,
+                      tts: str | None, clock: str, timestamp: str) -> dict:
+    """Assemble the HA analysis payload; decision must be sanitized."""
+    risk = decision["risk"]
     risk_upper = risk.upper()
-    det_type = str(decision.get("type", "other")).replace("_", " ").title()
-    confidence = decision.get("confidence", 0.0)
-    reason = str(decision.get("reason", ""))
-    action = str(decision.get("action", "notify_only"))
-    behavior = str(decision.get("behavior", ""))
-    camera_zone = str(policy.get("camera_zone", "unknown")).replace("-", " ").title()
-    home_mode = str(policy.get("home_mode", "unknown")).title()
-    time_of_day = str(policy.get("time_of_day", "unknown")).title()
-    now_ts = datetime.now(timezone.utc)
+    det_type = _title_label(decision["type"], "_")
+    confidence = decision["confidence"]
+    reason = decision["reason"]
+    action = decision["action"]
+    behavior = decision["behavior"]
+    camera_zone = _title_label(str(policy.get("camera_zone", "unknown")), "-")
+    home_mode = _title_label(str(policy.get("home_mode", "unknown")))
+    time_of_day = _title_label(str(policy.get("time_of_day", "unknown")))
 
     # Subject info
     subject_obj = decision.get("subject", {})
@@ -1764,23 +2669,14 @@ def publish_analysis(client: mqtt.Client, camera: str, label: str,
         subject_desc = det_type
 
     # Clean analysis text (no JSON, no MEDIA lines)
-    clean_analysis = strip_json_block(analysis).strip()
-    clean_lines = []
-    for line in clean_analysis.splitlines():
-        s = line.strip()
-        if not s or s.lower().startswith("media:") or "ai-snapshots/" in s.lower():
-            continue
-        if s.lower().startswith("attached"):
-            continue
-        clean_lines.append(s)
-    clean_analysis = "\n".join(clean_lines).strip()
+    clean_analysis = _HA_JUNK_LINE_RE.sub("", strip_json_block(analysis))
+    clean_analysis = _HA_LINE_BREAK_RE.sub("\n", clean_analysis).strip()
 
     # Build structured analysis for HA persistent notification
-    severity_emoji = {"low": "\U0001f7e2", "medium": "\U0001f7e1", "high": "\U0001f7e0", "critical": "\U0001f534"}
-    s_icon = severity_emoji.get(risk, "")
+    s_icon = _HA_SEVERITY_EMOJI.get(risk, "")
     ha_analysis = (
         f"{s_icon} Risk: {risk_upper}\n"
-        f"Time: {now_ts.strftime('%H:%M:%S')}\n\n"
+        f"Time: {clock}\n\n"
         f"Subject: {identity} — {subject_desc}\n\n"
     )
     if behavior:
@@ -1791,18 +2687,16 @@ def publish_analysis(client: mqtt.Client, camera: str, label: str,
         f"Confidence: {confidence:.2f}\n"
         f"Reason: {reason}\n\n"
         f"Context: {camera_zone} | {home_mode} | {time_of_day}\n"
-        f"Action: {action.replace('_', ' ').title()}"
+        f"Action: {_title_label(action, '_')}"
     )
 
-    # Media info
-    media_decision = decide_media(risk)
-
-    payload = {
+    media_fields = _HA_MEDIA_FIELDS.get(risk) or _HA_MEDIA_FIELDS[None]
+    return {
         "camera": camera,
         "label": label,
         "analysis": ha_analysis,
         "risk": risk,
-        "type": str(decision.get("type", "other")),
+        "type": decision["type"],
         "confidence": confidence,
         "action": action,
         "reason": reason,
@@ -1812,36 +2706,141 @@ def publish_analysis(client: mqtt.Client, camera: str, label: str,
         "camera_zone": camera_zone,
         "home_mode": home_mode,
         "time_of_day": time_of_day,
-        "media_snapshot": media_decision["snapshot"],
-        "media_clip": media_decision["clip"],
-        "media_clip_length": media_decision["clip_length"],
-        "media_monitoring": media_decision["monitoring"],
-        "tts": make_tts(camera, analysis, decision, policy),
-        "timestamp": now_ts.isoformat(),
+        **media_fields,
+        "tts": make_tts(camera, analysis, decision, policy) if tts is None else tts,
+        "timestamp": timestamp,
         "event_id": event_id,
         "snapshot_path": str(snapshot_path),
-        "clip_url": f"{FRIGATE_API}/api/events/{event_id}/clip.mp4" if media_decision["clip"] else "",
+        "clip_url": f"{_FRIGATE_EVENTS_URL}{event_id}/clip.mp4" if media_fields["media_clip"] else "",
     }
-    result = client.publish(MQTT_TOPIC_PUBLISH, json.dumps(payload), qos=1, retain=True)
+
+
+_now_strings_cache: tuple[int, str, str] = (0, "", "")
+
+
+def _now_strings() -> tuple[str, str]:
+    """Return (HH:MM:SS, ISO timestamp) for the current UTC second, formatted once per second."""
+    global _now_strings_cache
+    secs = int(time.time())
+    cached = _now_strings_cache
+    if cached[0] != secs:
+        dt = datetime.fromtimestamp(secs, timezone.utc)
+        cached = _now_strings_cache = (secs, dt.strftime("%H:%M:%S"), dt.isoformat())
+    return cached[1], cached[2]
+
+
+def _publish_ha_body(client: mqtt.Client, event_id: str, body: bytes, pending: bool = False) -> None:
+    """Publish (or, for placeholders, defer) an encoded HA payload."""
+    # Publish under the lock so a placeholder timer firing concurrently can
+    # never land after (and overwrite) the final retained message.
+    with _pending_publishes_lock:
+        superseded = _pending_publishes.pop(event_id, None)
+        if superseded is not None:
+            superseded.cancel()
+            log.debug("Coalesced pending publish for %s into final analysis", event_id)
+        if pending and PUBLISH_COALESCE_MS > 0:
+            timer = threading.Timer(PUBLISH_COALESCE_MS / 1000.0, _flush_pending_publish,
+                                    args=(client, event_id, body))
+            timer.daemon = True
+            _pending_publishes[event_id] = timer
+            timer.start()
+            return
+        result = client.publish(MQTT_TOPIC_PUBLISH, body, qos=1, retain=True)
     log.info("Published analysis to %s (rc=%s)", MQTT_TOPIC_PUBLISH, result.rc)
 
 
+def publish_analysis(client: mqtt.Client, camera: str, label: str,
+                     analysis: str, event_id: str, snapshot_path: Path,
+                     decision: dict | None = None, policy: dict | None = None,
+                     pending: bool = False, tts: str | None = None):
+    """Publish structured AI analysis to MQTT for Home Assistant.
+
+    decision must come from sanitize_decision (None builds one from the
+    analysis text), so its fields are read without re-coercion. Pass tts
+    when the caller already built it with make_tts for the same inputs.
+    A pending placeholder is held for PUBLISH_COALESCE_MS; if the final
+    analysis for the same event arrives in that window it replaces the
+    placeholder and only one retained message goes out.
+    """
+    if decision is None:
+        decision = sanitize_decision(_fallback_decision(analysis))
+    if policy is None:
+        policy = {}
+    clock, timestamp = _now_strings()
+    payload = _build_ha_payload(camera, label, analysis, event_id, snapshot_path, decision, policy,
+                                tts, clock, timestamp)
+    _publish_ha_body(client, event_id, _json_dumps_bytes(payload), pending)
+
+
+_KNOWN_FACE_DECISION = sanitize_decision({
+    "risk": "low",
+    "type": "known_person",
+    "confidence": 0.95,
+    "action": "notify_only",
+    "reason": "known face excluded",
+})
+# Markers survive JSON encoding untouched and are swapped for per-event values.
+_MARK_CLOCK, _MARK_TIMESTAMP, _MARK_EVENT_ID = "@@CLOCK@@", "@@TIMESTAMP@@", "@@EVENT_ID@@"
+
+
+@functools.lru_cache(maxsize=32)
+def _known_face_payload_template(camera: str, label: str) -> bytes:
+    """Encoded known-face exclusion payload for one camera, with markers."""
+    analysis = f"Person detected on {camera} — ignored because known face was detected."
+    payload = _build_ha_payload(camera, label, analysis, _MARK_EVENT_ID, Path(""),
+                                _KNOWN_FACE_DECISION, {}, None, _MARK_CLOCK, _MARK_TIMESTAMP)
+    return _json_dumps_bytes(payload)
+
+
+def publish_known_face_skip(client: mqtt.Client, camera: str, label: str, event_id: str) -> None:
+    """Publish the fixed "known face excluded" notice without rebuilding it."""
+    clock, timestamp = _now_strings()
+    body = (
+        _known_face_payload_template(camera, label)
+        .replace(_MARK_CLOCK.encode(), clock.encode())
+        .replace(_MARK_TIMESTAMP.encode(), timestamp.encode())
+        .replace(_MARK_EVENT_ID.encode(), _json_dumps_bytes(event_id)[1:-1])
+    )
+    _publish_ha_body(client, event_id, body)
+
+
 # ---------------------------------------------------------------------------
 # MQTT callbacks
 # ---------------------------------------------------------------------------
 def on_connect(client, userdata, flags, rc, properties=None):
     if rc == 0:
         log.info("Connected to MQTT broker %s:%d", MQTT_HOST, MQTT_PORT)
+        try:
+            client.socket().setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (AttributeError, OSError) as exc:
+            log.debug("Could not set TCP_NODELAY on MQTT socket: %s", exc)
         client.subscribe(MQTT_TOPIC_SUBSCRIBE)
         log.info("Subscribed to %s", MQTT_TOPIC_SUBSCRIBE)
+        if HA_STATESTREAM_PREFIX:
+            statestream_topic = f"{HA_STATESTREAM_PREFIX}/+/+/state"
+            client.message_callback_add(statestream_topic, on_ha_state_message)
+            client.subscribe(statestream_topic)
+            log.info("Subscribed to HA state stream %s", statestream_topic)
     else:
         log.error("MQTT connection failed with code %s", rc)
 
 
+def on_ha_state_message(client, userdata, msg):
+    """Invalidate cached HA state when mqtt_statestream reports a change."""
+    parts = msg.topic.rsplit("/", 3)
+    if len(parts) == 4:
+        ha_state_invalidate(f"{parts[1]}.{parts[2]}")
+
+
 def on_message(client, userdata, msg):
+    # Most traffic is "update"/"end" or non-person events. A raw byte check
+    # drops them before parsing; it only rejects, so key spacing doesn't matter.
+    payload = msg.payload
+    if b'"new"' not in payload or b'"person"' not in payload:
+        return
     try:
-        data = json.loads(msg.payload)
-    except (json.JSONDecodeError, ValueError):
+        data = _json_loads(payload)  # bytes straight from paho; orjson skips the decode
+    except ValueError:
         return
 
     before = data.get("before", {})
@@ -1862,6 +2861,31 @@ def on_message(client, userdata, msg):
     if not event_id:
         return
 
+    # Frigate can re-emit "new" for the same event after a reconnect.
+    if event_id in _seen_events:
+        log.info("Ignoring duplicate event %s (%s)", event_id, camera)
+        return
+    _seen_events[event_id] = None
+    if len(_seen_events) > _SEEN_EVENTS_MAX:
+        _seen_events.popitem(last=False)
+
+    # Hand the slow pipeline (HA/Frigate/VLM round-trips) to a worker so the
+    # paho network thread keeps dispatching events from other cameras.
+    if _event_executor is None:
+        handle_event(client, camera, label, event_id)
+        return
+    _event_executor.submit(_run_event, client, camera, label, event_id)
+
+
+def _run_event(client, camera: str, label: str, event_id: str) -> None:
+    try:
+        handle_event(client, camera, label, event_id)
+    except Exception:
+        log.exception("Event pipeline failed for %s (%s)", event_id, camera)
+
+
+def handle_event(client, camera: str, label: str, event_id: str) -> None:
+    """Full per-event pipeline: policy → snapshot → AI analysis → actions."""
     log.info("Person detected on %s (event %s)", camera, event_id)
     if PHASE3_ENABLED:
         policy = get_policy_context(camera)
@@ -1878,17 +2902,12 @@ def on_message(client, userdata, msg):
     history_summary = _recent_events_summary(camera) if PHASE4_ENABLED else "- disabled"
     if PHASE3_ENABLED:
         log.info("Policy context for %s: %s", camera, policy)
-    if PHASE4_ENABLED:
+    if PHASE4_ENABLED and log.isEnabledFor(logging.INFO):
         log.info("Recent events summary for %s: %s", camera, history_summary.replace("\n", " | "))
 
     if EXCLUDE_KNOWN_FACES and bool(policy.get("known_faces_present", False)):
         log.info("Skipping %s — known faces present and exclude_known_faces=true", event_id)
-        publish_analysis(
-            client, camera, label,
-            f"Person detected on {camera} — ignored because known face was detected.",
-            event_id, Path(""),
-            {"risk": "low", "type": "known_person", "confidence": 0.95, "action": "notify_only", "reason": "known face excluded"},
-        )
+        publish_known_face_skip(client, camera, label, event_id)
         return
 
     if is_on_cooldown(camera):
@@ -1896,12 +2915,36 @@ def on_message(client, userdata, msg):
         return
 
     # Wait for snapshot to be ready
-    time.sleep(3)
+    if not _wait_for_snapshot(event_id):
+        return
 
     snapshot_path = download_snapshot(event_id)
     if not snapshot_path:
         return
 
+    # Cheap rule pre-filter: routine daytime event with the household present
+    if PHASE3_ENABLED and PREFLIGHT_LOW_RISK_ENABLED and _preflight_risk(policy) == "low":
+        log.info("Preflight rated %s low risk — skipping vision analysis", event_id)
+        decision = sanitize_decision({
+            "risk": "low",
+            "type": "unknown_person",
+            "confidence": 0.5,
+            "action": "notify_only",
+            "reason": "routine daytime activity with household present (preflight)",
+        })
+        analysis_text = f"[{camera}] Threat: LOW\nPerson detected during routine daytime activity; vision analysis skipped."
+        deliver = WHATSAPP_MIN_RISK_LEVEL == "low"
+        # The WhatsApp alert attaches the staged snapshot, so stage it first.
+        if deliver and not stage_snapshot_for_openclaw(snapshot_path, event_id):
+            return
+        publish_analysis(client, camera, label, analysis_text, event_id, snapshot_path, decision, policy)
+        if deliver:
+            deliver_whatsapp_message(camera, event_id, analysis_text, decision, policy)
+        if PHASE4_ENABLED:
+            append_event_history(camera, event_id, decision)
+        _record_event(camera)
+        return
+
     # Stage the snapshot for OpenClaw media delivery
     staged_path = stage_snapshot_for_openclaw(snapshot_path, event_id)
     if not staged_path:
@@ -1911,7 +2954,7 @@ def on_message(client, userdata, msg):
     publish_analysis(
         client, camera, label,
         f"Person detected on {camera} — vision analysis pending.",
-        event_id, snapshot_path,
+        event_id, snapshot_path, pending=True,
     )
 
     analysis = send_to_openclaw(camera, event_id, policy, history_summary)
@@ -1919,13 +2962,12 @@ def on_message(client, userdata, msg):
         decision = sanitize_decision(parse_decision_json(analysis))
         # Pillar 2: Apply rule-based severity scoring (overrides AI if rules disagree)
         rule_risk = score_severity(decision, policy)
-        ai_risk = str(decision.get("risk", "low")).lower()
+        ai_risk = decision["risk"]  # sanitize_decision already lowercased it
         if rule_risk != ai_risk:
             log.info("Rule engine adjusted risk: AI=%s -> Rules=%s for %s", ai_risk, rule_risk, event_id)
             decision["risk"] = rule_risk
             # Re-map action based on new risk
-            risk_action_map = {"low": "notify_only", "medium": "notify_and_save_clip", "high": "notify_and_light", "critical": "notify_and_alarm"}
-            decision["action"] = risk_action_map.get(rule_risk, decision.get("action", "notify_only"))
+            decision["action"] = _RISK_DEFAULT_ACTION.get(rule_risk, decision.get("action", "notify_only"))
         analysis_text = strip_json_block(analysis)
         decision, confirmation_note = maybe_confirm_decision(
             camera=camera,
@@ -1937,18 +2979,17 @@ def on_message(client, userdata, msg):
         decision = sanitize_decision(decision)
         if confirmation_note:
             analysis_text = f"{analysis_text}\n\n{confirmation_note}".strip()
+        tts_msg = make_tts(camera, analysis_text, decision, policy)
         publish_analysis(client, camera, label, analysis_text, event_id,
-                         snapshot_path, decision, policy)
+                         snapshot_path, decision, policy, tts=tts_msg)
         # Only send medium/high/critical alerts to WhatsApp (Phase 3 policy)
         # Phase 2 — execute the decided action via HA REST API (also saves clips)
-        tts_msg = make_tts(camera, analysis_text, decision, policy)
         execute_action(decision, camera, tts_msg, event_id=event_id)
         # WhatsApp delivery — only medium/high/critical (clip saved above is now available)
         alert_risk = decision.get("risk", "low")
-        risk_levels = ["low", "medium", "high", "critical"]
         min_risk = WHATSAPP_MIN_RISK_LEVEL
-        min_idx = risk_levels.index(min_risk) if min_risk in risk_levels else 1
-        alert_idx = risk_levels.index(alert_risk) if alert_risk in risk_levels else 0
+        min_idx = _RISK_RANK.get(min_risk, 1)
+        alert_idx = _RISK_RANK.get(alert_risk, 0)
         if alert_idx >= min_idx:
             deliver_whatsapp_message(camera, event_id, analysis_text, decision, policy)
         else:
@@ -1966,12 +3007,12 @@ def on_message(client, userdata, msg):
             "reason": "analysis unavailable",
         })
         analysis_text = f"[{camera}] Threat: LOW\nPerson detected. AI analysis unavailable."
-        publish_analysis(client, camera, label, analysis_text, event_id, snapshot_path, decision, policy)
         tts_msg = make_tts(camera, analysis_text, decision, policy)
+        publish_analysis(client, camera, label, analysis_text, event_id, snapshot_path, decision, policy,
+                         tts=tts_msg)
         execute_action(decision, camera, tts_msg, event_id=event_id)
-        risk_levels = ["low", "medium", "high", "critical"]
         min_risk = WHATSAPP_MIN_RISK_LEVEL
-        min_idx = risk_levels.index(min_risk) if min_risk in risk_levels else 1
+        min_idx = _RISK_RANK.get(min_risk, 1)
         if min_idx <= 0:
             deliver_whatsapp_message(camera, event_id, analysis_text, decision, policy)
         else:
@@ -1989,17 +3030,40 @@ def on_disconnect(client, userdata, flags, rc, properties=None):
 # Main
 # ---------------------------------------------------------------------------
 def main():
+    global _event_executor, _delivery_executor, _webhook_executor, _action_executor
+    global _history_writer_thread
     if not acquire_singleton_lock():
         log.error("Another bridge instance is already running; exiting.")
         sys.exit(1)
     log.info("Frigate → OpenClaw bridge starting")
     SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    _history_writer_thread = threading.Thread(target=_history_writer, name="history", daemon=True)
+    _history_writer_thread.start()
+    _event_executor = ThreadPoolExecutor(
+        max_workers=EVENT_WORKER_THREADS,
+        thread_name_prefix="event",
+    )
+    _delivery_executor = ThreadPoolExecutor(
+        max_workers=min(8, max(1, len(WHATSAPP_TO))),
+        thread_name_prefix="whatsapp",
+    )
+    _webhook_executor = ThreadPoolExecutor(
+        max_workers=EVENT_WORKER_THREADS,
+        thread_name_prefix="webhook",
+    )
+    _action_executor = ThreadPoolExecutor(
+        max_workers=EVENT_WORKER_THREADS * 3,
+        thread_name_prefix="action",
+    )
 
     client = mqtt.Client(
         client_id="frigate-openclaw-bridge",
         callback_api_version=mqtt.CallbackAPIVersion.VERSION2,
     )
     client.username_pw_set(MQTT_USER, MQTT_PASS)
+    # Workers publish concurrently; let QoS 1 publishes queue instead of stalling.
+    client.max_inflight_messages_set(64)
+    client.max_queued_messages_set(1000)
     client.on_connect = on_connect
     client.on_message = on_message
     client.on_disconnect = on_disconnect
@@ -2007,7 +3071,23 @@ def main():
 
     log.info("Connecting to MQTT %s:%d…", MQTT_HOST, MQTT_PORT)
     client.connect(MQTT_HOST, MQTT_PORT, keepalive=120)
-    client.loop_forever()
+    try:
+        client.loop_forever()
+    except KeyboardInterrupt:
+        log.info("Shutting down bridge")
+    finally:
+        # Wake any worker parked in a timed wait, then let in-flight events finish.
+        _shutdown.set()
+        _cancel_pending_publishes()
+        client.disconnect()
+        _event_executor.shutdown(wait=True, cancel_futures=True)
+        _delivery_executor.shutdown(wait=True)
+        _webhook_executor.shutdown(wait=False, cancel_futures=True)
+        _action_executor.shutdown(wait=True)
+        _history_queue.put(None)  # flush queued history rows
+        _history_writer_thread.join(timeout=10)
+        for session in (SESSION_FRIGATE, SESSION_HA, SESSION_OLLAMA, SESSION_OPENCLAW):
+            session.close()
 
 
 if __name__ == "__main__":
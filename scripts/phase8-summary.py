@@ -9,12 +9,25 @@ daily or weekly report, and optionally:
 
 import argparse
 import json
-from collections import Counter, defaultdict
+import mmap
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import paho.mqtt.client as mqtt
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # optional: faster JSON for history parsing and the MQTT payload
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+_json_dumps = orjson.dumps if orjson is not None else json.dumps  # bytes or str; paho takes either
 
 
 EVENT_HISTORY_FILE = Path("/home/techposts/frigate/storage/events-history.jsonl")
@@ -87,6 +100,10 @@ def parse_iso_utc(ts: str) -> datetime | None:
     if not ts:
         return None
     try:
+        # Fast path: the bridge writes aware UTC isoformat(), which parses to
+        # a timezone.utc datetime with no suffix rewrite or conversion needed.
+        if ts.endswith("+00:00"):
+            return datetime.fromisoformat(ts)
         dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
         if dt.tzinfo is None:
             return dt.replace(tzinfo=timezone.utc)
@@ -95,60 +112,87 @@ def parse_iso_utc(ts: str) -> datetime | None:
         return None
 
 
-def load_rows(path: Path) -> list[dict]:
-    if not path.exists():
+# Leading "YYYY-MM-DDTHH:MM:SS" of a row's timestamp; UTC ISO strings sort lexically.
+_ROW_TS_RE = re.compile(rb'"timestamp":\s*"(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)')
+# Rows from concurrent bridge workers can land slightly out of order.
+_WINDOW_SEEK_SLACK = timedelta(minutes=10)
+
+
+def _window_start_offset(buf, start: datetime) -> int:
+    """Binary-search the append-only history for the first line at/after start.
+
+    Only picks where parsing begins; rows are still filtered exactly after.
+    """
+    key = (start.astimezone(timezone.utc) - _WINDOW_SEEK_SLACK).strftime("%Y-%m-%dT%H:%M:%S").encode()
+    lo, hi = 0, len(buf)  # both always sit on line starts
+    while lo < hi:
+        mid = (lo + hi) // 2
+        line_start = buf.rfind(b"\n", 0, mid) + 1
+        line_end = buf.find(b"\n", line_start)
+        if line_end < 0:
+            line_end = len(buf)
+        match = _ROW_TS_RE.search(buf, line_start, line_end)
+        probe_end = line_end
+        # A blank/torn line has no timestamp; judge it by the next line that does.
+        while match is None and probe_end + 1 < hi:
+            next_start = probe_end + 1
+            probe_end = buf.find(b"\n", next_start)
+            if probe_end < 0:
+                probe_end = len(buf)
+            match = _ROW_TS_RE.search(buf, next_start, probe_end)
+        if match is not None and match.group(1) < key:
+            lo = probe_end + 1
+        else:
+            hi = line_start  # at/after the window, or undecidable: keep it
+    return min(lo, len(buf))
+
+
+def load_rows(path: Path, start: datetime | None = None, end: datetime | None = None) -> list[dict]:
+    """Parse history rows, keeping only those inside [start, end] when given.
+
+    With a start, the file is mmap'd and parsing begins near the window
+    start instead of at the first line.
+    """
+    try:
+        with path.open("rb") as fh:
+            try:
+                buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return []  # empty file
+    except FileNotFoundError:
         return []
+    with buf:
+        offset = _window_start_offset(buf, start) if start is not None else 0
+        lines = buf[offset:].splitlines()
     rows = []
-    with path.open("r", encoding="utf-8") as fh:
-        for line in fh:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                row = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            ts = parse_iso_utc(str(row.get("timestamp", "")))
-            if not ts:
-                continue
-            row["_ts"] = ts
-            rows.append(row)
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = _json_loads(line)
+        except ValueError:
+            continue
+        if not isinstance(row, dict):
+            continue
+        ts = parse_iso_utc(str(row.get("timestamp", "")))
+        if not ts:
+            continue
+        if (start is not None and ts < start) or (end is not None and ts > end):
+            continue
+        row["_ts"] = ts
+        rows.append(row)
     return rows
 
 
-def filter_window(rows: list[dict], start: datetime, end: datetime) -> list[dict]:
-    out = []
-    for row in rows:
-        ts = row.get("_ts")
-        if isinstance(ts, datetime) and start <= ts <= end:
-            out.append(row)
-    return out
-
-
 def build_summary(rows: list[dict], period: str, start: datetime, end: datetime) -> tuple[str, dict]:
     total = len(rows)
-    by_camera: dict[str, int] = Counter()
-    by_risk: dict[str, int] = Counter()
-    by_action: dict[str, int] = Counter()
-    by_type: dict[str, int] = Counter()
-    by_hour: dict[int, int] = Counter()
-    conf_by_risk: dict[str, list[float]] = defaultdict(list)
-
-    for r in rows:
-        cam = str(r.get("camera", "unknown"))
-        risk = str(r.get("risk", "unknown")).lower()
-        action = str(r.get("action", "unknown"))
-        kind = str(r.get("type", "other"))
-        conf = float(r.get("confidence", 0.0))
-
-        by_camera[cam] += 1
-        by_risk[risk] += 1
-        by_action[action] += 1
-        by_type[kind] += 1
-        conf_by_risk[risk].append(conf)
-        ts = r.get("_ts")
-        if isinstance(ts, datetime):
-            by_hour[ts.hour] += 1
+    # Counter consumes each column in C; confidence was never reported, so it
+    # is no longer coerced per row.
+    by_camera = Counter([str(r.get("camera", "unknown")) for r in rows])
+    by_risk = Counter([str(r.get("risk", "unknown")).lower() for r in rows])
+    by_action = Counter([str(r.get("action", "unknown")) for r in rows])
+    by_type = Counter([str(r.get("type", "other")) for r in rows])
+    by_hour = Counter([ts.hour for r in rows if isinstance(ts := r.get("_ts"), datetime)])
 
     peak_hour = None
     if by_hour:
@@ -252,20 +296,32 @@ def publish_mqtt(payload: dict) -> None:
     client.username_pw_set(MQTT_USER, MQTT_PASS)
     client.connect(MQTT_HOST, MQTT_PORT, keepalive=60)
     client.loop_start()
-    info = client.publish(MQTT_TOPIC_SUMMARY, json.dumps(payload), qos=1, retain=True)
+    info = client.publish(MQTT_TOPIC_SUMMARY, _json_dumps(payload), qos=1, retain=True)
     info.wait_for_publish(timeout=5)
     client.loop_stop()
     client.disconnect()
 
 
+def _delivery_session() -> requests.Session:
+    """One keep-alive session (auth headers included) for the recipient fan-out."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {OPENCLAW_TOKEN}",
+    })
+    return session
+
+
 def deliver_whatsapp(payload_data: dict) -> None:
     if not WHATSAPP_ENABLED:
         raise RuntimeError("whatsapp delivery disabled by config")
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {OPENCLAW_TOKEN}",
-    }
-    sent = 0
     ts = int(datetime.now(timezone.utc).timestamp())
     report_body = format_summary_whatsapp(payload_data)
     delivery_message = (
@@ -277,10 +333,12 @@ def deliver_whatsapp(payload_data: dict) -> None:
         f"{report_body}\n"
         "REPORT BODY END"
     )
-    for number in WHATSAPP_TO:
-        to = str(number).strip()
-        if not to:
-            continue
+    recipients = [to for to in (str(number).strip() for number in WHATSAPP_TO) if to]
+    if not recipients:
+        raise RuntimeError("no valid WhatsApp recipients configured")
+
+    def _send_one(session: requests.Session, to: str) -> str | None:
+        """POST one recipient; returns an error string instead of raising."""
         payload = {
             "message": delivery_message,
             "deliver": True,
@@ -290,13 +348,22 @@ def deliver_whatsapp(payload_data: dict) -> None:
             "sessionKey": f"frigate:summary:{OPENCLAW_DELIVERY_AGENT_NAME}:{to}:{ts}",
             "timeoutSeconds": 60,
         }
-        resp = requests.post(OPENCLAW_DELIVERY_WEBHOOK, json=payload, headers=headers, timeout=30)
+        try:
+            resp = session.post(OPENCLAW_DELIVERY_WEBHOOK, json=payload, timeout=30)
+        except requests.RequestException as exc:
+            return f"delivery failed for {to}: {exc}"
         if resp.status_code >= 300:
-            raise RuntimeError(f"delivery failed for {to}: HTTP {resp.status_code} {resp.text[:200]}")
-        sent += 1
+            return f"delivery failed for {to}: HTTP {resp.status_code} {resp.text[:200]}"
         print(f"WhatsApp accepted for {to}: HTTP {resp.status_code}")
-    if sent == 0:
-        raise RuntimeError("no valid WhatsApp recipients configured")
+        return None
+
+    # Recipients are independent webhook calls; cap concurrency so the local
+    # OpenClaw gateway is not flooded.
+    with _delivery_session() as session, \
+            ThreadPoolExecutor(max_workers=min(len(recipients), 4)) as pool:
+        errors = [err for err in pool.map(lambda to: _send_one(session, to), recipients) if err]
+    if errors:
+        raise RuntimeError("; ".join(errors))
 
 
 def main() -> int:
@@ -313,8 +380,7 @@ def main() -> int:
     else:
         start = end - timedelta(days=7)
 
-    rows = load_rows(EVENT_HISTORY_FILE)
-    window_rows = filter_window(rows, start, end)
+    window_rows = load_rows(EVENT_HISTORY_FILE, start, end)
     text, payload = build_summary(window_rows, args.period, start, end)
     print(text)
 
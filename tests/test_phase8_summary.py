@@ -0,0 +1,38 @@
+import importlib.util
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+_SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "phase8-summary.py"
+_spec = importlib.util.spec_from_file_location("phase8_summary", _SCRIPT)
+phase8 = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(phase8)
+
+
+class LoadRowsWindowTest(unittest.TestCase):
+    def test_malformed_lines_do_not_hide_window_rows(self):
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        lines = []
+        for hour in range(48):
+            ts = (base + timedelta(hours=hour)).isoformat()
+            lines.append(json.dumps({"timestamp": ts, "camera": "front", "risk": "low"}))
+            if hour % 7 == 3:
+                lines.append("")
+                lines.append('{"camera": "front", "risk": "lo')  # torn write
+                lines.append(json.dumps({"camera": "front"}))  # missing timestamp
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "history.jsonl"
+            path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            for start_hour in range(0, 48, 5):
+                start = base + timedelta(hours=start_hour)
+                end = start + timedelta(hours=12)
+                rows = phase8.load_rows(path, start, end)
+                expected = [h for h in range(48) if start_hour <= h <= start_hour + 12]
+                self.assertEqual([r["_ts"] for r in rows],
+                                 [base + timedelta(hours=h) for h in expected])
+
+
+if __name__ == "__main__":
+    unittest.main()